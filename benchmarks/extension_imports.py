@@ -0,0 +1,38 @@
+import subprocess, sys, statistics
+
+SCENARIOS = {
+    "import flaskpp": "import flaskpp",
+    "sqlalchemy only": "import flaskpp\nfrom flaskpp.app.extensions import db, migrate",
+    "all extensions": "import flaskpp\nfrom flaskpp.app.extensions import "
+                      "limiter, db, migrate, socket, babel, security, oauth, mailer, cache, api, jwt",
+}
+HEAVY = ("flask_security", "authlib", "flask_limiter", "flask_smorest", "flask_jwt_extended", "flask_mailman",
+         "flask_caching", "flask_sqlalchemy")
+
+
+def _importtime(code: str) -> tuple[float, set[str]]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    total, loaded = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if not name.startswith("  "):
+            total += int(cumulative)
+        loaded.add(name.strip().split(".")[0])
+    return total / 1000, loaded
+
+
+def main(runs: int = 5):
+    for label, code in SCENARIOS.items():
+        samples = [_importtime(code) for _ in range(runs)]
+        loaded = samples[-1][1]
+        heavy = ", ".join(name for name in HEAVY if name in loaded) or "-"
+        print(f"{label:18} {statistics.median(ms for ms, _ in samples):8.1f} ms  heavy: {heavy}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
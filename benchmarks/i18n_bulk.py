@@ -0,0 +1,48 @@
+from flask import Flask
+from tempfile import TemporaryDirectory
+from pathlib import Path
+import sys, time
+
+from flaskpp.app.extensions import db
+from flaskpp.app.data import babel
+
+
+def _app(path: Path) -> Flask:
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    db.init_app(app)
+    return app
+
+
+def _rows(n: int, locale: str):
+    return ({"locale": locale, "key": f"KEY_{i}", "text": f"Translation {i}"} for i in range(n))
+
+
+def main(n: int = 2000):
+    with TemporaryDirectory() as tmp:
+        app = _app(Path(tmp) / "bench.db")
+        with app.app_context():
+            db.create_all()
+
+            start = time.perf_counter()
+            for row in _rows(n, "de"):
+                babel.add_entry(row["locale"], row["key"], row["text"])
+            per_row = time.perf_counter() - start
+
+            start = time.perf_counter()
+            babel.import_entries(_rows(n, "en"))
+            bulk = time.perf_counter() - start
+
+            start = time.perf_counter()
+            babel.import_entries(_rows(n, "en"))
+            upsert = time.perf_counter() - start
+
+    print(f"rows:             {n}")
+    print(f"add_entry loop:   {per_row:8.3f}s ({n / per_row:10.0f} rows/s)")
+    print(f"import_entries:   {bulk:8.3f}s ({n / bulk:10.0f} rows/s)")
+    print(f"re-import upsert: {upsert:8.3f}s ({n / upsert:10.0f} rows/s)")
+    print(f"speedup:          {per_row / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
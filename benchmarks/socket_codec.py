@@ -0,0 +1,62 @@
+import sys, time
+
+from flask import Flask
+from socketio.packet import Packet, EVENT
+
+from flaskpp.app.socket import default_event, decode_frame, event_table, event_version, init_dispatch
+
+# Client -> server default_event frames. Server emits keep their named socket.io events and are not measured here.
+EVENTS = [f"form_{name}" for name in ("save", "validate", "search", "select", "upload", "submit")]
+PAYLOAD = {"ts": 1700000000, "value": 42.5, "field": "title"}
+
+for _name in EVENTS:
+    default_event(_name)(lambda payload: payload)
+
+_app = Flask(__name__)
+_app.config["SOCKETIO_COMPACT_FRAMES"] = True
+init_dispatch(_app)
+
+
+def _frames(compact: bool) -> list:
+    ids = {name: idx for idx, name in enumerate(event_table())}
+    version = event_version()
+    return [
+        ["default_event", [version, ids[name], PAYLOAD] if compact else {"event": name, "payload": PAYLOAD}]
+        for name in EVENTS
+    ]
+
+
+def _run(n: int, compact: bool, packet_class=Packet) -> tuple[float, float, int]:
+    frames = _frames(compact)
+    size = sum(len(packet_class(EVENT, data=frame).encode()) for frame in frames) / len(frames)
+    encoded = [packet_class(EVENT, data=frame).encode() for frame in frames]
+
+    start = time.perf_counter()
+    for i in range(n):
+        packet_class(EVENT, data=frames[i % len(frames)]).encode()
+    encode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n):
+        pkt = packet_class(encoded_packet=encoded[i % len(encoded)])
+        decode_frame(pkt.data[1])
+    decode = time.perf_counter() - start
+    return encode, decode, size
+
+
+def main(n: int = 100000):
+    codecs = [("json, named events", False, Packet), ("json, interned event ids", True, Packet)]
+    try:
+        from socketio.msgpack_packet import MsgPackPacket
+        codecs.append(("msgpack, interned event ids", True, MsgPackPacket))
+    except ImportError:
+        pass
+
+    print(f"inbound client frames: {n}")
+    for label, compact, packet_class in codecs:
+        encode, decode, size = _run(n, compact, packet_class)
+        print(f"{label:28} {size:6.1f} bytes/msg  encode {n / encode:9.0f}/s  decode {n / decode:9.0f}/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,56 @@
+from flask import Flask
+import asyncio, sys, time
+
+from flaskpp.app import socket as fpp_socket
+from flaskpp.app.socket import default_event, init_dispatch, dispatch
+from flaskpp.app.utils.translating import get_locale
+
+
+class Server:
+    def get_environ(self, sid, namespace="/"):
+        return {
+            "PATH_INFO": "/socket.io/",
+            "HTTP_COOKIE": "lang=de; session=abc",
+            "HTTP_ACCEPT_LANGUAGE": "de-DE,de;q=0.9,en;q=0.8",
+            "HTTP_USER_AGENT": "bench",
+        }
+
+
+@default_event("bench")
+async def handle(_):
+    return get_locale()
+
+
+@default_event("bench_plain")
+async def handle_plain(_):
+    return "de"
+
+
+async def _run(n: int, event: str, sid, fresh: bool = False) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        if fresh:
+            fpp_socket.release_connection(sid)
+        await dispatch(event, None, sid)
+    return time.perf_counter() - start
+
+
+def main(n: int = 20000):
+    app = Flask(__name__)
+    app.config["SUPPORTED_LOCALES"] = "en;de"
+
+    fpp_socket._pool["app"] = None
+    plain = asyncio.run(_run(n, "bench_plain", None))
+
+    init_dispatch(app, Server())
+    fresh = asyncio.run(_run(n, "bench", "sid", fresh=True))
+    pooled = asyncio.run(_run(n, "bench", "sid"))
+
+    print(f"events:                   {n}")
+    print(f"no context:               {n / plain:10.0f} events/s")
+    print(f"request context per event:{n / fresh:10.0f} events/s")
+    print(f"pooled request context:   {n / pooled:10.0f} events/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
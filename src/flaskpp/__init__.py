@@ -1,3 +1,7 @@
+from time import perf_counter
+from flaskpp.utils.timeline import rss, StartupTimeline
+_import_baseline = {"started": perf_counter(), "rss": rss()}
+
 from flask import Flask, Blueprint, render_template as _render_template, url_for
 from werkzeug.middleware.proxy_fix import ProxyFix
 from markupsafe import Markup
@@ -7,20 +11,24 @@ from asgiref.wsgi import WsgiToAsgi
 from socketio import ASGIApp
 from pathlib import Path
 from importlib import import_module
+from functools import partial
 import os, json, re
 
 from flaskpp.app.config import CONFIG_MAP
 from flaskpp.app.config.default import DefaultConfig
 from flaskpp.app.utils.processing import handlers
-from flaskpp.app.i18n import init_i18n
+from flaskpp.app.i18n import init_i18n, serve_bundle
+from flaskpp.app.profiler import init_profiler
 from flaskpp.modules import register_modules, ManifestError, ModuleError
-from flaskpp.tailwind import generate_tailwind_css
+from flaskpp.tailwind import generate_tailwind_css, verify_tailwind_css
 from flaskpp.utils import enabled
-from flaskpp.utils.debugger import start_session, log, exception
+from flaskpp.utils.debugger import start_session, log, exception, debug_msg
 
 _fpp_default = Blueprint("fpp_default", __name__,
                          static_folder=(Path(__file__).parent / "app" / "static").resolve(),
                          static_url_path="/fpp-static")
+_fpp_default.add_url_rule("/fpp-i18n/<locale>/<domain>.<version>.json",
+                          "translation_bundle", serve_bundle)
 
 
 def _fix_missing(migrations):
@@ -65,10 +73,15 @@ def set_default_handlers(app):
 
 class FlaskPP(Flask):
     def __init__(self, import_name: str, config_name: str):
+        baseline = _import_baseline.copy()
+        _import_baseline.clear()
+        self.startup = StartupTimeline(baseline.get("started"), baseline.get("rss"))
+        self.startup.mark("imports")
         super().__init__(import_name)
         self.config.from_object(CONFIG_MAP.get(config_name, DefaultConfig))
 
-        start_session(enabled("DEBUG_MODE"))
+        start_session(enabled("DEBUG_MODE"), self.config.get("LOG_SAMPLING"))
+        self.startup.mark("config")
 
         if self.config["PROXY_FIX"]:
             count = self.config["PROXY_COUNT"]
@@ -82,10 +95,12 @@ class FlaskPP(Flask):
         if self.config["RATELIMIT"]:
             from flaskpp.app.extensions import limiter
             limiter.init_app(self)
+            self.startup.mark("ratelimit")
 
         fpp_processing = enabled("FPP_PROCESSING")
         if fpp_processing:
             set_default_handlers(self)
+            self.startup.mark("processing")
 
         ext_database = enabled("EXT_SQLALCHEMY")
         db_updater = None
@@ -98,10 +113,7 @@ class FlaskPP(Flask):
 
             if enabled("DB_AUTOUPDATE"):
                 db_updater = Thread(target=db_autoupdate, args=(self,))
-
-        if enabled("EXT_SOCKET") and fpp_processing:
-            from flaskpp.app.extensions import socket
-            socket.on("default_event")(handlers["socket_event_handler"])
+            self.startup.mark("sqlalchemy")
 
         if enabled("EXT_BABEL"):
             from flaskpp.app.extensions import babel
@@ -112,6 +124,11 @@ class FlaskPP(Flask):
             self.extensions["babel_domain"] = domain
             self.route("/lang/<locale>")(set_locale)
 
+            if enabled("BABEL_SYNC"):
+                from flaskpp.app.utils.i18n_sync import init_sync
+                init_sync(self)
+            self.startup.mark("babel")
+
         if enabled("EXT_FST"):
             if not ext_database:
                 raise RuntimeError("For EXT_FST EXT_SQLALCHEMY extension must be enabled.")
@@ -123,58 +140,109 @@ class FlaskPP(Flask):
                 self,
                 SQLAlchemyUserDatastore(db, User, Role)
             )
+            self.startup.mark("fst")
 
         if enabled("EXT_AUTHLIB"):
             from flaskpp.app.extensions import oauth
             oauth.init_app(self)
+            self.startup.mark("authlib")
 
         if enabled("EXT_MAILING"):
             from flaskpp.app.extensions import mailer
             mailer.init_app(self)
+            self.startup.mark("mailing")
 
         if enabled("EXT_CACHE"):
             from flaskpp.app.extensions import cache
             cache.init_app(self)
+            self.startup.mark("cache")
 
         if enabled("EXT_API"):
             from flaskpp.app.extensions import api
             api.init_app(self)
+            self.startup.mark("api")
 
         if enabled("EXT_JWT_EXTENDED"):
             from flaskpp.app.extensions import jwt
             jwt.init_app(self)
+            self.startup.mark("jwt")
 
-        generate_tailwind_css(self)
+        if enabled("PREBUILT_FRONTEND"):
+            verify_tailwind_css(self)
+        else:
+            generate_tailwind_css(self)
+        self.startup.mark("tailwind")
 
         self.register_blueprint(_fpp_default)
         self.url_prefix = ""
         register_modules(self)
         self.static_url_path = f"{self.url_prefix}/static"
+        self.startup.mark("module loaders")
+
+        if enabled("EXT_SOCKET") and fpp_processing:
+            from flaskpp.app.extensions import socket
+            from flaskpp.app.socket import init_dispatch, socket_namespaces
+            from flaskpp.app.utils.socket_queue import init_queue
+            from flaskpp.app.utils.socket_flow import init_flow
+            init_queue(self, socket)
+            init_flow(self)
+            init_dispatch(self, socket)
+            for namespace in socket_namespaces():
+                socket.on("default_event", namespace=namespace)(
+                    partial(handlers["socket_event_handler"], namespace=namespace)
+                )
+                socket.on("connect", namespace=namespace)(handlers["socket_connect_handler"])
+                socket.on("disconnect", namespace=namespace)(handlers["socket_disconnect_handler"])
+            self.startup.mark("socket")
 
         if enabled("FRONTEND_ENGINE"):
-            from flaskpp.fpp_node.vite import Frontend
+            from flaskpp.fpp_node.vite import Frontend, build_bundle
             engine = Frontend(self)
+            build_bundle(engine)
             self.context_processor(lambda: {
                 "vite_main": engine.vite
             })
             self.frontend_engine = engine
+            self.startup.mark("frontend")
 
         init_i18n(self)
+        self.startup.mark("i18n")
+
+        if enabled("EXT_METRICS"):
+            from flaskpp.app.metrics import init_metrics
+            init_metrics(self)
+            self.startup.mark("metrics")
+
+        init_profiler(self)
 
         if db_updater:
             db_updater.start()
+        self.startup.mark("finish")
+
+        for line in self.startup.summary():
+            debug_msg(f"[startup] {line}")
 
         self._asgi_app = None
 
-    def to_asgi(self) -> WsgiToAsgi | ASGIApp:
+    def create_global_jinja_loader(self):
+        if enabled("EXT_BABEL") and enabled("BABEL_PRECOMPILE"):
+            from flaskpp.app.i18n import LocaleTemplateLoader
+            return LocaleTemplateLoader(self)
+        return super().create_global_jinja_loader()
+
+    def to_asgi(self):
         if self._asgi_app is not None:
             return self._asgi_app
 
         app = WsgiToAsgi(self)
         if enabled("EXT_SOCKET"):
             from flaskpp.app.extensions import socket
-            self._asgi_app = ASGIApp(socket, other_asgi_app=app)
-            return self._asgi_app
+            from flaskpp.app.socket import bind_loop
+            app = ASGIApp(socket, other_asgi_app=app, on_startup=bind_loop)
+        if enabled("FRONTEND_ENGINE") and enabled("DEBUG_MODE"):
+            from flaskpp.fpp_node.proxy import ViteDevProxy
+            from flaskpp.fpp_node.vite import dev_servers
+            app = ViteDevProxy(app, dev_servers)
         self._asgi_app = app
         return app
 
@@ -297,6 +365,18 @@ class Module(Blueprint):
 
         return version_str
 
+    @property
+    def namespace(self) -> str:
+        return f"/{self.safe_name}"
+
+    def socket_event(self, name: str, max_concurrency: int = None, middleware: list = None):
+        from flaskpp.app.socket import default_event
+        return default_event(name, max_concurrency, self.namespace, middleware)
+
+    def socket_middleware(self, fn=None):
+        from flaskpp.app.socket import socket_middleware
+        return socket_middleware(fn, self.namespace)
+
     def render_template(self, template: str, **context) -> str:
         render_name = template if self.home else f"{self.safe_name}/{template}"
         return _render_template(render_name, **context)
@@ -0,0 +1,203 @@
+from flask import Flask
+from pathlib import Path
+from tqdm import tqdm
+import typer, os
+
+from flaskpp.utils import enabled
+from flaskpp.utils.run import conf_path, _env_from_conf
+
+i18n = typer.Typer(help="Import and export the translations of the Flask++ i18n database.")
+
+
+def _data_app(app_name: str) -> Flask:
+    conf = conf_path / f"{app_name}.conf"
+    if not conf.exists():
+        typer.echo(typer.style(f"Missing app config '{conf.name}'.", fg=typer.colors.RED, bold=True))
+        raise typer.Exit(1)
+    os.environ.update(_env_from_conf(conf))
+
+    from flaskpp.app.extensions import db
+    import flaskpp.app.data.babel
+
+    root = Path.cwd()
+    app = Flask("main", root_path=str(root), instance_path=str(root / "instance"))
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL", "sqlite:///database.db")
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+
+    if enabled("EXT_BABEL") and enabled("BABEL_SYNC"):
+        from flaskpp.app.utils.i18n_sync import init_sync
+        app.config["BABEL_SYNC_URL"] = os.getenv("BABEL_SYNC_URL") or f"{os.getenv('REDIS_URL', 'redis://localhost:6379')}/4"
+        app.config["BABEL_SYNC_CHANNEL"] = os.getenv("BABEL_SYNC_CHANNEL", "fpp:i18n:invalidate")
+        init_sync(app, listen=False)
+    return app
+
+
+@i18n.command("import")
+def import_(
+        file: Path,
+        app: str = typer.Option(..., "-a", "--app", help="The app whose database should be filled."),
+        locale: str = typer.Option(None, "-l", "--locale", help="Locale for files without a locale column (e.g. .po)."),
+        domain: str = typer.Option("messages", "-d", "--domain"),
+        fmt: str = typer.Option(None, "-f", "--format", help="po, csv, json or jsonl. (Default is the file ending.)"),
+        batch_size: int = typer.Option(1000, "-b", "--batch-size")
+):
+    from flaskpp.app.data.babel import import_entries, read_entries
+
+    if not file.exists():
+        typer.echo(typer.style(f"File {file} does not exist.", fg=typer.colors.RED, bold=True))
+        raise typer.Exit(1)
+
+    with _data_app(app).app_context():
+        rows = read_entries(file, locale=locale, domain=domain, fmt=fmt)
+        with tqdm(unit=" rows", desc=f"Importing {file.name}") as bar:
+            count = import_entries(rows, batch_size=batch_size, progress=bar.update)
+
+    typer.echo(typer.style(f"Imported {count} translations.", fg=typer.colors.GREEN, bold=True))
+
+
+@i18n.command("export")
+def export(
+        file: Path,
+        app: str = typer.Option(..., "-a", "--app", help="The app whose database should be exported."),
+        locale: str = typer.Option(None, "-l", "--locale"),
+        domain: str = typer.Option(None, "-d", "--domain"),
+        fmt: str = typer.Option(None, "-f", "--format", help="csv, json or jsonl. (Default is the file ending.)"),
+        batch_size: int = typer.Option(1000, "-b", "--batch-size")
+):
+    from flaskpp.app.data.babel import export_entries, write_entries
+
+    with _data_app(app).app_context():
+        rows = tqdm(export_entries(locale, domain, batch_size), unit=" rows", desc=f"Exporting {file.name}")
+        count = write_entries(rows, file, fmt=fmt)
+
+    typer.echo(typer.style(f"Exported {count} translations to {file}.", fg=typer.colors.GREEN, bold=True))
+
+
+@i18n.command()
+def remove(
+        keys: list[str],
+        app: str = typer.Option(..., "-a", "--app"),
+        locale: str = typer.Option(None, "-l", "--locale"),
+        domain: str = typer.Option(None, "-d", "--domain")
+):
+    from flaskpp.app.data.babel import delete_entries
+
+    with _data_app(app).app_context():
+        count = delete_entries(keys, locale=locale, domain=domain)
+
+    typer.echo(typer.style(f"Removed {count} translations.", fg=typer.colors.YELLOW, bold=True))
+
+
+def i18n_entry(app: typer.Typer):
+    app.add_typer(i18n, name="i18n")
+
+
+profile = typer.Typer(help="Inspect the request profiles of your Flask++ apps.")
+
+
+def _frame_shares(stacks) -> dict[str, float]:
+    total = sum(stacks.values()) or 1
+    shares = {}
+    for stack, count in stacks.items():
+        for frame in set(stack.split(";")):
+            shares[frame] = shares.get(frame, 0) + count
+    return {frame: count / total for frame, count in shares.items()}
+
+
+@profile.command("list")
+def list_(directory: Path = typer.Option(Path("profiles"), "-d", "--dir")):
+    from flaskpp.app.profiler import read_stacks
+
+    files = sorted(directory.rglob("*.collapsed")) if directory.exists() else []
+    if not files:
+        typer.echo(typer.style(f"No profiles found in {directory}.", fg=typer.colors.YELLOW, bold=True))
+        return
+
+    for file in files:
+        samples = sum(read_stacks(file).values())
+        typer.echo(f"{str(file.relative_to(directory)):60} {samples:8} samples")
+
+
+@profile.command()
+def diff(
+        base: Path,
+        other: Path,
+        top: int = typer.Option(20, "-n", "--top", help="Number of frames to show.")
+):
+    from flaskpp.app.profiler import read_stacks
+
+    before, after = _frame_shares(read_stacks(base)), _frame_shares(read_stacks(other))
+    deltas = sorted(
+        ((after.get(frame, 0) - before.get(frame, 0), frame) for frame in before.keys() | after.keys()),
+        key=lambda item: abs(item[0]), reverse=True
+    )
+    for delta, frame in deltas[:top]:
+        color = typer.colors.RED if delta > 0 else typer.colors.GREEN
+        typer.echo(typer.style(f"{delta * 100:+7.2f}%", fg=color) + f"  {frame}")
+
+
+@profile.command()
+def token(app: str = typer.Option(..., "-a", "--app", help="The app the token should be valid for.")):
+    from flaskpp.app.profiler import profile_token
+
+    conf = conf_path / f"{app}.conf"
+    if not conf.exists():
+        typer.echo(typer.style(f"Missing app config '{conf.name}'.", fg=typer.colors.RED, bold=True))
+        raise typer.Exit(1)
+
+    from flaskpp.app.config.default import DefaultConfig
+    secret = _env_from_conf(conf).get("SECRET_KEY") or DefaultConfig.SECRET_KEY
+    typer.echo(f"X-Fpp-Profile: {profile_token(secret)}")
+
+
+def profile_entry(app: typer.Typer):
+    app.add_typer(profile, name="profile")
+
+
+_report_script = """
+import json, sys
+sys.path.insert(0, '.')
+import main
+from flaskpp.utils.timeline import last_timeline
+timeline = last_timeline()
+with open(sys.argv[1], 'w') as f:
+    json.dump(timeline.as_dict() if timeline else None, f)
+"""
+
+
+def startup_report(
+        app: str = typer.Option(..., "-a", "--app", help="The app whose startup should be measured."),
+        as_json: bool = typer.Option(False, "--json", help="Print the raw timeline as json.")
+):
+    import subprocess, sys, json, tempfile
+
+    conf = conf_path / f"{app}.conf"
+    if not conf.exists():
+        typer.echo(typer.style(f"Missing app config '{conf.name}'.", fg=typer.colors.RED, bold=True))
+        raise typer.Exit(1)
+
+    env = _env_from_conf(conf)
+    env["APP_NAME"] = app
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "startup.json"
+        result = subprocess.run([sys.executable, "-c", _report_script, str(out)],
+                                env=env, cwd=Path.cwd(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        report = json.loads(out.read_text()) if result.returncode == 0 and out.exists() else None
+
+    if not report:
+        if result.stdout:
+            typer.echo(result.stdout.rstrip(), err=True)
+        reason = f"exit status {result.returncode}" if result.returncode else "no startup timeline recorded"
+        typer.echo(typer.style(f"Failed to boot '{app}' ({reason}).", fg=typer.colors.RED, bold=True))
+        raise typer.Exit(1)
+
+    if as_json:
+        typer.echo(json.dumps(report, indent=2))
+        return
+
+    typer.echo(typer.style(f"{'phase':40} {'ms':>9} {'rss delta':>11}", bold=True))
+    for entry in sorted(report["phases"], key=lambda e: e["seconds"], reverse=True):
+        line = f"{entry['phase'][:40]:40} {entry['seconds'] * 1000:9.1f} {entry['rss_delta'] / 1048576:+9.1f}MB"
+        typer.echo(typer.style(line, fg=typer.colors.YELLOW) if entry["seconds"] >= report["total"] / 4 else line)
+    typer.echo(typer.style(f"{'total':40} {report['total'] * 1000:9.1f} {report['rss'] / 1048576:9.1f}MB", bold=True))
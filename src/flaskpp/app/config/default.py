@@ -17,6 +17,22 @@ class DefaultConfig:
     PROXY_FIX = False
     PROXY_COUNT = 1
 
+    LOG_SAMPLING = {
+        "request": float(os.getenv("LOG_REQUEST_SAMPLING", 1)),
+    }
+    ACCESS_LOG = os.getenv("ACCESS_LOG", "text")
+    ACCESS_LOG_SAMPLING = {
+        "*": float(os.getenv("ACCESS_LOG_SAMPLING", 1)),
+    }
+    METRICS_DIR = os.getenv("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL = 5
+
+    PROFILING = os.getenv("PROFILING", "off")
+    PROFILE_RATE = 1.0
+    PROFILE_INTERVAL = 0.005
+    PROFILE_DIR = "profiles"
+    PROFILE_AGGREGATE = True
+
     # -------------------------------------------------
     # Flask-SQLAlchemy & Flask-Migrate
     # -------------------------------------------------
@@ -34,8 +50,20 @@ class DefaultConfig:
     # -------------------------------------------------
     # Flask-SocketIO
     # -------------------------------------------------
-    SOCKETIO_MESSAGE_QUEUE = f"{os.getenv('REDIS_URL', 'redis://localhost:6379')}/2"
+    SOCKETIO_MESSAGE_QUEUE = f"{os.getenv('REDIS_URL')}/2" if os.getenv("REDIS_URL") else None
+    SOCKETIO_QUEUE_CHANNEL = "flaskpp-socketio"
+    SOCKETIO_PUBLISH_BATCH = 64
+    SOCKETIO_PUBLISH_INTERVAL = 0.005
     SOCKETIO_CORS_ALLOWED_ORIGINS = "*"
+    SOCKETIO_HANDLER_THREADS = 16
+    SOCKETIO_EVENT_CONCURRENCY = 0
+    SOCKETIO_REQUEST_CONTEXT = True
+    SOCKETIO_COMPACT_FRAMES = False
+    SOCKETIO_RATE_LIMIT = 0
+    SOCKETIO_RATE_BURST = 0
+    SOCKETIO_OUTBOUND_HIGH_WATER = 0
+    SOCKETIO_OUTBOUND_POLICY = "drop"
+    SOCKETIO_SLOW_CONSUMER_TIMEOUT = 10
 
     # -------------------------------------------------
     # Flask-BabelPlus (i18n/l10n)
@@ -44,6 +72,8 @@ class DefaultConfig:
     SUPPORTED_LOCALES = os.getenv("SUPPORTED_LOCALES", BABEL_DEFAULT_LOCALE)
     BABEL_DEFAULT_TIMEZONE = "Europe/Berlin"
     BABEL_TRANSLATION_DIRECTORIES = "translations"
+    BABEL_SYNC_URL = f"{os.getenv('REDIS_URL', 'redis://localhost:6379')}/4"
+    BABEL_SYNC_CHANNEL = "fpp:i18n:invalidate"
 
     # -------------------------------------------------
     # Flask-Security-Too
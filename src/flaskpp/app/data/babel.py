@@ -1,6 +1,17 @@
+from threading import Lock
+from typing import Callable, Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+import csv, json
+
 from flaskpp.app.data import add_model, delete_model, commit
 from flaskpp.app.extensions import db
 
+_catalogs: dict[tuple[str, str], tuple[int, dict[str, str]]] = {}
+_versions: dict[tuple[str, str], int] = {}
+_catalog_lock = Lock()
+_invalidation_hooks: list[Callable[[str, str, int], None]] = []
+
 
 class I18nMessage(db.Model):
     __tablename__ = "i18n_messages"
@@ -19,9 +30,61 @@ class I18nMessage(db.Model):
         self.text = text
 
 
+def catalog_version(locale: str, domain: str = "messages") -> int:
+    return _versions.get((domain, locale), 0)
+
+
+def on_invalidate(fn: Callable[[str, str, int], None]):
+    _invalidation_hooks.append(fn)
+    return fn
+
+
+def drop_catalog(locale: str, domain: str = "messages") -> int:
+    with _catalog_lock:
+        version = _versions.get((domain, locale), 0) + 1
+        _versions[(domain, locale)] = version
+        _catalogs.pop((domain, locale), None)
+    return version
+
+
+def drop_catalogs():
+    with _catalog_lock:
+        for slot in set(_versions) | set(_catalogs):
+            _versions[slot] = _versions.get(slot, 0) + 1
+        _catalogs.clear()
+
+
+def invalidate_catalog(locale: str, domain: str = "messages") -> int:
+    version = drop_catalog(locale, domain)
+    for hook in _invalidation_hooks:
+        hook(locale, domain, version)
+    return version
+
+
+def get_catalog(locale: str, domain: str = "messages") -> dict[str, str]:
+    slot = (domain, locale)
+    version = _versions.get(slot, 0)
+    cached = _catalogs.get(slot)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    rows = (
+        db.session.query(I18nMessage.key, I18nMessage.text)
+        .filter_by(domain=domain, locale=locale)
+        .all()
+    )
+    catalog = {key: text for key, text in rows}
+
+    with _catalog_lock:
+        if _versions.get(slot, 0) == version:
+            _catalogs[slot] = (version, catalog)
+    return catalog
+
+
 def add_entry(locale: str, key: str, text: str, domain: str = "messages"):
     entry = I18nMessage(domain, locale, key, text)
     add_model(entry)
+    invalidate_catalog(locale, domain)
 
 
 def get_entry(key: str, domain: str = "messages"):
@@ -36,10 +99,183 @@ def remove_entry(key: str, locale: str, domain: str = "messages"):
     entry = I18nMessage.query.filter_by(key=key, locale=locale, domain=domain).first()
     if entry:
         delete_model(entry)
+        invalidate_catalog(locale, domain)
 
 
 def remove_entries(key: str):
-    entries = I18nMessage.query.filter_by(key=key).all()
-    for entry in entries:
-        delete_model(entry, False)
+    delete_entries([key])
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    it = iter(rows)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _upsert_statement():
+    table = I18nMessage.__table__
+    dialect = db.engine.dialect.name
+
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.domain, table.c.locale, table.c.key],
+            set_={"text": stmt.excluded.text}
+        )
+
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update(text=stmt.inserted.text)
+
+    return None
+
+
+def _merge_rows(batch: list[dict]):
+    for row in batch:
+        entry = I18nMessage.query.filter_by(
+            domain=row["domain"], locale=row["locale"], key=row["key"]
+        ).first()
+        if entry:
+            entry.text = row["text"]
+        else:
+            db.session.add(I18nMessage(row["domain"], row["locale"], row["key"], row["text"]))
+
+
+def import_entries(rows: Iterable[dict], batch_size: int = 1000,
+                   progress: Callable[[int], None] = None) -> int:
+    stmt = _upsert_statement()
+    touched = set()
+    count = 0
+
+    for batch in _batches(rows, batch_size):
+        for row in batch:
+            row.setdefault("domain", "messages")
+            touched.add((row["locale"], row["domain"]))
+
+        if stmt is not None:
+            db.session.execute(stmt, batch)
+        else:
+            _merge_rows(batch)
+        commit()
+
+        count += len(batch)
+        if progress:
+            progress(len(batch))
+
+    for locale, domain in touched:
+        invalidate_catalog(locale, domain)
+    return count
+
+
+def delete_entries(keys: Iterable[str], locale: str = None, domain: str = None,
+                   batch_size: int = 1000) -> int:
+    count = 0
+    touched = set()
+
+    for batch in _batches(keys, batch_size):
+        query = I18nMessage.query.filter(I18nMessage.key.in_(batch))
+        if locale:
+            query = query.filter_by(locale=locale)
+        if domain:
+            query = query.filter_by(domain=domain)
+
+        touched.update(query.with_entities(I18nMessage.locale, I18nMessage.domain).distinct().all())
+        count += query.delete(synchronize_session=False)
     commit()
+
+    for entry_locale, entry_domain in touched:
+        invalidate_catalog(entry_locale, entry_domain)
+    return count
+
+
+def export_entries(locale: str = None, domain: str = None, batch_size: int = 1000) -> Iterator[dict]:
+    query = db.session.query(
+        I18nMessage.domain, I18nMessage.locale, I18nMessage.key, I18nMessage.text
+    ).order_by(I18nMessage.domain, I18nMessage.locale, I18nMessage.key)
+    if locale:
+        query = query.filter_by(locale=locale)
+    if domain:
+        query = query.filter_by(domain=domain)
+
+    for row in query.yield_per(batch_size):
+        yield {"domain": row.domain, "locale": row.locale, "key": row.key, "text": row.text}
+
+
+def read_entries(file: Path, locale: str = None, domain: str = "messages", fmt: str = None) -> Iterator[dict]:
+    fmt = (fmt or file.suffix.lstrip(".")).lower()
+
+    def entry(key, text, row_locale=None, row_domain=None) -> dict:
+        row_locale = row_locale or locale
+        if not row_locale:
+            raise ValueError(f"Missing locale for '{key}' in {file.name}.")
+        return {"domain": row_domain or domain, "locale": row_locale, "key": key, "text": text}
+
+    if fmt in ("po", "pot"):
+        from babel.messages.pofile import read_po
+        with open(file, "rb") as f:
+            catalog = read_po(f, locale=locale, domain=domain)
+        for message in catalog:
+            if not message.id or not message.string:
+                continue
+            if message.pluralizable:
+                for msgid, text in zip(message.id, message.string):
+                    if text:
+                        yield entry(msgid, text)
+            else:
+                yield entry(message.id, message.string)
+
+    elif fmt == "csv":
+        with open(file, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield entry(row["key"], row["text"], row.get("locale"), row.get("domain"))
+
+    elif fmt == "jsonl":
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield entry(row["key"], row["text"], row.get("locale"), row.get("domain"))
+
+    elif fmt == "json":
+        data = json.loads(file.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            for key, text in data.items():
+                yield entry(key, text)
+        else:
+            for row in data:
+                yield entry(row["key"], row["text"], row.get("locale"), row.get("domain"))
+
+    else:
+        raise ValueError(f"Unsupported translation format '{fmt}'.")
+
+
+def write_entries(rows: Iterable[dict], file: Path, fmt: str = None) -> int:
+    fmt = (fmt or file.suffix.lstrip(".")).lower()
+    count = 0
+
+    with open(file, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=["domain", "locale", "key", "text"])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        elif fmt == "jsonl":
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+        elif fmt == "json":
+            f.write("[")
+            for row in rows:
+                f.write(("," if count else "") + "\n  " + json.dumps(row, ensure_ascii=False))
+                count += 1
+            f.write("\n]\n")
+        else:
+            raise ValueError(f"Unsupported export format '{fmt}'.")
+
+    return count
@@ -1,31 +1,101 @@
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from socketio import AsyncServer
-from flask_babelplus import Babel
-from flask_security import Security
-from authlib.integrations.flask_client import OAuth
-from flask_mailman import Mail
-from flask_caching import Cache
-from flask_smorest import Api
-from flask_jwt_extended import JWTManager
 from functools import wraps
+from threading import RLock
 
 from flaskpp.utils import enabled
 from flaskpp.utils.debugger import log
 
-limiter = Limiter(get_remote_address)
-db = SQLAlchemy()
-migrate = Migrate()
-socket = AsyncServer(async_mode="asgi", cors_allowed_origins="*")
-babel = Babel()
-security = Security()
-oauth = OAuth()
-mailer = Mail()
-cache = Cache()
-api = Api()
-jwt = JWTManager()
+
+def _limiter():
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+    return Limiter(get_remote_address)
+
+
+def _db():
+    from flask_sqlalchemy import SQLAlchemy
+    return SQLAlchemy()
+
+
+def _migrate():
+    from flask_migrate import Migrate
+    return Migrate()
+
+
+def _socket():
+    from socketio import AsyncServer
+    return AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+
+
+def _babel():
+    from flask_babelplus import Babel
+    return Babel()
+
+
+def _security():
+    from flask_security import Security
+    return Security()
+
+
+def _oauth():
+    from authlib.integrations.flask_client import OAuth
+    return OAuth()
+
+
+def _mailer():
+    from flask_mailman import Mail
+    return Mail()
+
+
+def _cache():
+    from flask_caching import Cache
+    from flaskpp.app.metrics import counted_cache
+
+    class CountedCache(Cache):
+        @property
+        def cache(self):
+            return counted_cache(super().cache)
+    return CountedCache()
+
+
+def _api():
+    from flask_smorest import Api
+    return Api()
+
+
+def _jwt():
+    from flask_jwt_extended import JWTManager
+    return JWTManager()
+
+
+_factories = {
+    "limiter": _limiter,
+    "db": _db,
+    "migrate": _migrate,
+    "socket": _socket,
+    "babel": _babel,
+    "security": _security,
+    "oauth": _oauth,
+    "mailer": _mailer,
+    "cache": _cache,
+    "api": _api,
+    "jwt": _jwt,
+}
+_create_lock = RLock()
+
+
+def __getattr__(name: str):
+    factory = _factories.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _create_lock:
+        if name not in globals():
+            globals()[name] = factory()
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_factories))
 
 
 def require_extensions(*extensions):
@@ -1,9 +1,26 @@
 from flask_babelplus import Domain
 from babel.support import Translations
-from flask import Flask, current_app
+from flask import (Flask, Response, current_app, g, has_app_context, has_request_context,
+                   abort, redirect, request, url_for)
+from flask.templating import DispatchingJinjaLoader
+from jinja2 import Environment, Template
+from jinja2.ext import Extension
+from jinja2.lexer import Token, TokenStream
+from contextvars import ContextVar
+from threading import Lock
+import gettext, hashlib, json, os
 
-from flaskpp.app.data.babel import I18nMessage
-from flaskpp.app.utils.translating import t, tn, get_locale
+from flaskpp.app.data.babel import get_catalog, catalog_version
+from flaskpp.app.metrics import inc
+from flaskpp.app.utils.translating import t, tn, get_locale, _supported_locales
+from flaskpp.utils import enabled
+
+_registry: dict[tuple[str, str, str], tuple[float, "DBMergedTranslations"]] = {}
+_registry_lock = Lock()
+_bundles: dict[tuple[str, str], tuple[tuple, bytes, str]] = {}
+_DB_LOOKUP = (("source", "db"),)
+_CATALOG_LOOKUP = (("source", "catalog"),)
+_fold_translations: ContextVar["DBMergedTranslations | None"] = ContextVar("fpp_fold_translations", default=None)
 
 
 class DBMergedTranslations(Translations):
@@ -14,17 +31,14 @@ class DBMergedTranslations(Translations):
         self._locale = locale
 
     def _db_get(self, msgid):
-        row = (
-            I18nMessage.query
-            .filter_by(domain=self._domain, locale=self._locale, key=msgid)
-            .first()
-        )
-        return row.text if row else None
+        return get_catalog(self._locale, self._domain).get(msgid)
 
     def gettext(self, message):
         db_val = self._db_get(message)
         if db_val:
+            inc("fpp_translation_lookups_total", _DB_LOOKUP)
             return db_val
+        inc("fpp_translation_lookups_total", _CATALOG_LOOKUP)
         mo_val = self._wrapped.gettext(message)
         return mo_val
 
@@ -32,22 +46,187 @@ class DBMergedTranslations(Translations):
         key = plural if n != 1 else singular
         db_val = self._db_get(key)
         if db_val:
+            inc("fpp_translation_lookups_total", _DB_LOOKUP)
             return db_val
+        inc("fpp_translation_lookups_total", _CATALOG_LOOKUP)
         mo_val = self._wrapped.ngettext(singular, plural, n)
         return mo_val
 
 
+def _mo_mtime(dirname: str, locale: str, domain: str) -> float:
+    mtime = 0.0
+    for file in gettext.find(domain, dirname, [locale], all=True):
+        try:
+            mtime = max(mtime, os.path.getmtime(file))
+        except OSError:
+            continue
+    return mtime
+
+
+def load_translations(dirname: str, locale: str, domain: str = "messages") -> DBMergedTranslations:
+    key = (dirname, locale, domain)
+    cached = _registry.get(key)
+    debug = enabled("DEBUG_MODE")
+    if cached and not debug:
+        return cached[1]
+
+    mtime = _mo_mtime(dirname, locale, domain) if debug else 0.0
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    wrapped = Translations.load(
+        dirname=dirname,
+        locales=locale,
+        domain=domain
+    )
+    translations = DBMergedTranslations(wrapped, domain=domain, locale=locale)
+
+    with _registry_lock:
+        _registry[key] = (mtime, translations)
+    return translations
+
+
+def clear_translations():
+    with _registry_lock:
+        _registry.clear()
+
+
 class DBDomain(Domain):
     def get_translations(self):
-        locale = get_locale()
+        domain = self.domain or "messages"
+        if has_request_context():
+            request_cache = g.setdefault("_fpp_translations", {})
+            translations = request_cache.get(domain)
+            if translations is not None:
+                return translations
+        else:
+            request_cache = None
 
-        wrapped = Translations.load(
-            dirname=current_app.config.get("BABEL_TRANSLATION_DIRECTORIES", "translations"),
-            locales=locale,
-            domain=self.domain or "messages"
+        translations = load_translations(
+            current_app.config.get("BABEL_TRANSLATION_DIRECTORIES", "translations"),
+            str(get_locale()),
+            domain
         )
 
-        return DBMergedTranslations(wrapped, domain=self.domain, locale=locale)
+        if request_cache is not None:
+            request_cache[domain] = translations
+        return translations
+
+
+def translation_bundle(locale: str, domain: str = "messages") -> tuple[bytes, str]:
+    translations = load_translations(
+        current_app.config.get("BABEL_TRANSLATION_DIRECTORIES", "translations"),
+        locale,
+        domain
+    )
+    stamp = (catalog_version(locale, domain), id(translations))
+    cached = _bundles.get((domain, locale))
+    if cached and cached[0] == stamp:
+        return cached[1], cached[2]
+
+    wrapped = translations._wrapped
+    messages, plurals = {}, {}
+    for key, text in getattr(wrapped, "_catalog", {}).items():
+        if isinstance(key, tuple):
+            forms = plurals.setdefault(key[0], [])
+            forms.extend([None] * (key[1] + 1 - len(forms)))
+            forms[key[1]] = text
+        elif key:
+            messages[key] = text
+    messages.update(get_catalog(locale, domain))
+
+    plural_forms = getattr(wrapped, "_info", {}).get("plural-forms", "")
+    plural = plural_forms.split("plural=", 1)[1].rstrip(" ;") if "plural=" in plural_forms else "n != 1"
+
+    body = json.dumps({
+        "locale": locale,
+        "domain": domain,
+        "plural": plural,
+        "messages": messages,
+        "plurals": plurals,
+    }, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:16]
+
+    _bundles[(domain, locale)] = (stamp, body, digest)
+    return body, digest
+
+
+def bundle_url(domain: str = None, locale: str = None) -> str:
+    domain = domain or current_app.extensions["babel_domain"].domain or "messages"
+    locale = locale or str(get_locale())
+    _, digest = translation_bundle(locale, domain)
+    return url_for("fpp_default.translation_bundle", locale=locale, domain=domain, version=digest)
+
+
+def serve_bundle(locale: str, domain: str, version: str) -> Response:
+    babel_domain = current_app.extensions.get("babel_domain")
+    if babel_domain is None or locale not in _supported_locales() or domain != (babel_domain.domain or "messages"):
+        abort(404)
+
+    body, digest = translation_bundle(locale, domain)
+    if version != digest:
+        response = redirect(url_for("fpp_default.translation_bundle", locale=locale, domain=domain, version=digest))
+        response.cache_control.no_cache = True
+        return response
+
+    response = Response(body, mimetype="application/json")
+    response.set_etag(digest)
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
+
+
+class TranslationFolding(Extension):
+    functions = {"_"}
+
+    def filter_stream(self, stream: TokenStream):
+        translations = _fold_translations.get()
+        if translations is None:
+            yield from stream
+            return
+
+        tokens = list(stream)
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if (token.type == "name" and token.value in self.functions
+                    and (i == 0 or tokens[i - 1].type != "dot")
+                    and [tok.type for tok in tokens[i + 1:i + 4]] == ["lparen", "string", "rparen"]):
+                yield Token(token.lineno, "string", translations.gettext(tokens[i + 2].value))
+                i += 4
+                continue
+            yield token
+            i += 1
+
+
+class LocaleTemplateLoader(DispatchingJinjaLoader):
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        self._variants: dict[tuple[str, str], tuple[tuple, Template]] = {}
+
+    def load(self, environment: Environment, name: str, globals=None) -> Template:
+        if not has_app_context():
+            return super().load(environment, name, globals)
+
+        translations = current_app.extensions["babel_domain"].get_translations()
+        key = (translations._locale, name)
+        stamp = (catalog_version(translations._locale, translations._domain), id(translations))
+
+        cached = self._variants.get(key)
+        if cached and cached[0] == stamp and (not environment.auto_reload or cached[1].is_up_to_date):
+            if globals:
+                cached[1].globals.update(globals)
+            return cached[1]
+
+        token = _fold_translations.set(translations)
+        try:
+            template = super().load(environment, name, globals)
+        finally:
+            _fold_translations.reset(token)
+
+        self._variants[key] = (stamp, template)
+        return template
 
 
 def init_i18n(app: Flask):
@@ -55,3 +234,10 @@ def init_i18n(app: Flask):
         _=t,
         ngettext=tn
     )
+
+    if "babel_domain" in app.extensions:
+        app.context_processor(lambda: {"i18n_bundle": bundle_url})
+
+    if isinstance(app.jinja_env.loader, LocaleTemplateLoader):
+        app.jinja_env.add_extension(TranslationFolding)
+        app.jinja_env.cache = None
@@ -0,0 +1,333 @@
+from flask import Flask, Response, request
+from pathlib import Path
+from threading import Thread, Lock, local
+from bisect import bisect_left
+import json, os, time
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_state = {
+    "enabled": False,
+    "dir": None,
+    "writer": None,
+}
+_meta: dict[str, tuple[str, str]] = {}
+_collectors: list = []
+_stores: list[dict] = []
+_stores_lock = Lock()
+_local = local()
+
+
+def describe(name: str, kind: str, help_text: str):
+    _meta[name] = (kind, help_text)
+
+
+def collector(fn):
+    _collectors.append(fn)
+    return fn
+
+
+def _store() -> dict:
+    store = getattr(_local, "store", None)
+    if store is None:
+        store = _local.store = {"counter": {}, "gauge": {}, "histogram": {}}
+        with _stores_lock:
+            _stores.append(store)
+    return store
+
+
+def inc(name: str, labels: tuple = (), value: float = 1):
+    if not _state["enabled"]:
+        return
+    counters = _store()["counter"]
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + value
+
+
+def gauge_add(name: str, value: float, labels: tuple = ()):
+    if not _state["enabled"]:
+        return
+    gauges = _store()["gauge"]
+    key = (name, labels)
+    gauges[key] = gauges.get(key, 0) + value
+
+
+def observe(name: str, value: float, labels: tuple = ()):
+    if not _state["enabled"]:
+        return
+    histograms = _store()["histogram"]
+    key = (name, labels)
+    series = histograms.get(key)
+    if series is None:
+        series = histograms[key] = [0] * (len(_BUCKETS) + 1) + [0.0]
+    series[bisect_left(_BUCKETS, value)] += 1
+    series[-1] += value
+
+
+def _copy(d: dict) -> list:
+    while True:
+        try:
+            return list(d.items())
+        except RuntimeError:
+            continue
+
+
+def snapshot() -> dict:
+    merged = {"counter": {}, "gauge": {}, "histogram": {}}
+    with _stores_lock:
+        stores = list(_stores)
+
+    for store in stores:
+        for kind in ("counter", "gauge"):
+            target = merged[kind]
+            for key, value in _copy(store[kind]):
+                target[key] = target.get(key, 0) + value
+        target = merged["histogram"]
+        for key, series in _copy(store["histogram"]):
+            current = target.get(key)
+            target[key] = list(series) if current is None else [a + b for a, b in zip(current, series)]
+
+    for fn in _collectors:
+        for kind, name, labels, value in fn():
+            merged[kind][(name, labels)] = value
+    return merged
+
+
+def _encode(data: dict) -> dict:
+    return {kind: [[name, list(labels), value] for (name, labels), value in series.items()]
+            for kind, series in data.items()}
+
+
+def _decode(data: dict) -> dict:
+    return {kind: {(name, tuple(tuple(label) for label in labels)): value for name, labels, value in series}
+            for kind, series in data.items()}
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+
+def _dump():
+    directory = _state["dir"]
+    file = directory / f"fpp-{os.getpid()}.json"
+    tmp = file.with_suffix(".tmp")
+    tmp.write_text(json.dumps(_encode(snapshot())))
+    os.replace(tmp, file)
+
+
+def clear_metrics_dir(directory: str | Path):
+    for file in Path(directory).glob("fpp-*.*"):
+        if file.suffix in (".json", ".tmp"):
+            file.unlink(missing_ok=True)
+
+
+def _run_writer(interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            _dump()
+        except OSError:
+            pass
+
+
+def aggregate() -> dict:
+    directory = _state["dir"]
+    if directory is None:
+        return snapshot()
+
+    _dump()
+    merged = {"counter": {}, "gauge": {}, "histogram": {}}
+    for file in directory.glob("fpp-*.json"):
+        try:
+            data = _decode(json.loads(file.read_text()))
+        except (OSError, ValueError):
+            continue
+
+        alive = _alive(int(file.stem.split("-", 1)[1]))
+        for kind, series in data.items():
+            if kind == "gauge" and not alive:
+                continue
+            target = merged[kind]
+            for key, value in series.items():
+                current = target.get(key)
+                if current is None:
+                    target[key] = value
+                elif kind == "histogram":
+                    target[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = current + value
+    return merged
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = tuple(labels) + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render(data: dict) -> str:
+    lines = []
+    for kind in ("counter", "gauge", "histogram"):
+        by_name: dict[str, list] = {}
+        for (name, labels), value in sorted(data[kind].items(), key=lambda item: (item[0][0], item[0][1])):
+            by_name.setdefault(name, []).append((labels, value))
+
+        for name, series in by_name.items():
+            help_text = _meta.get(name, (kind, ""))[1]
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                if kind != "histogram":
+                    lines.append(f"{name}{_labels(labels)} {value}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(_BUCKETS + ("+Inf",), value[:-1]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {value[-1]}")
+                lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view():
+    return Response(render(aggregate()), mimetype="text/plain; version=0.0.4")
+
+
+def _before_request():
+    request.environ["fpp.metrics_start"] = time.perf_counter()
+    gauge_add("fpp_http_requests_in_flight", 1)
+
+
+def _after_request(response):
+    start = request.environ.get("fpp.metrics_start")
+    labels = (("blueprint", request.blueprint or ""), ("endpoint", request.endpoint or ""))
+    if start is not None:
+        observe("fpp_http_request_duration_seconds", time.perf_counter() - start, labels)
+    inc("fpp_http_responses_total", labels + (("status", response.status_code),))
+    return response
+
+
+def _teardown_request(_):
+    if "fpp.metrics_start" in request.environ:
+        gauge_add("fpp_http_requests_in_flight", -1)
+
+
+def _instrument_db(app: Flask):
+    from sqlalchemy import event
+    from flaskpp.app.extensions import db
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "checkout")
+    def checkout(_, record, __):
+        record.info["fpp.checkout"] = time.perf_counter()
+        gauge_add("fpp_db_connections_checked_out", 1)
+
+    @event.listens_for(engine, "checkin")
+    def checkin(_, record):
+        start = record.info.pop("fpp.checkout", None)
+        if start is not None:
+            observe("fpp_db_checkout_seconds", time.perf_counter() - start)
+            gauge_add("fpp_db_connections_checked_out", -1)
+
+
+_CACHE_HIT = (("result", "hit"),)
+_CACHE_MISS = (("result", "miss"),)
+
+
+class _CountedCache:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def get(self, *args, **kwargs):
+        value = self._backend.get(*args, **kwargs)
+        inc("fpp_cache_requests_total", _CACHE_MISS if value is None else _CACHE_HIT)
+        return value
+
+    def get_many(self, *keys):
+        values = self._backend.get_many(*keys)
+        for value in values:
+            inc("fpp_cache_requests_total", _CACHE_MISS if value is None else _CACHE_HIT)
+        return values
+
+    def get_dict(self, *keys):
+        return dict(zip(keys, self.get_many(*keys)))
+
+    def has(self, *args, **kwargs):
+        found = self._backend.has(*args, **kwargs)
+        inc("fpp_cache_requests_total", _CACHE_HIT if found else _CACHE_MISS)
+        return found
+
+
+def counted_cache(backend):
+    return _CountedCache(backend) if _state["enabled"] else backend
+
+
+def _socket_metrics():
+    from flaskpp.app.socket import _pool, _stats
+    metrics = [
+        ("counter", "fpp_socket_events_total", (("namespace", namespace), ("event", event)),
+         stats["handled"] + stats["failed"] + stats["rejected"])
+        for namespace, events in list(_stats.items())
+        for event, stats in list(events.items())
+    ]
+
+    server = _pool["server"]
+    if server is not None:
+        metrics += [
+            ("gauge", "fpp_socket_connections", (("namespace", namespace),), len(rooms.get(None, {})))
+            for namespace, rooms in list(server.manager.rooms.items())
+        ]
+    return metrics
+
+
+describe("fpp_http_request_duration_seconds", "histogram", "Request latency by blueprint and endpoint.")
+describe("fpp_http_responses_total", "counter", "Responses by blueprint, endpoint and status.")
+describe("fpp_http_requests_in_flight", "gauge", "Requests currently being handled.")
+describe("fpp_socket_connections", "gauge", "Connected sockets per namespace.")
+describe("fpp_socket_events_total", "counter", "Socket events per namespace and event.")
+describe("fpp_db_checkout_seconds", "histogram", "Time database connections stay checked out of the pool.")
+describe("fpp_db_connections_checked_out", "gauge", "Database connections currently checked out.")
+describe("fpp_cache_requests_total", "counter", "Cache lookups by result (hit/miss).")
+describe("fpp_translation_lookups_total", "counter", "Translation lookups by source (db/catalog).")
+
+
+def init_metrics(app: Flask):
+    from flaskpp.utils import enabled
+
+    _state["enabled"] = True
+    app.add_url_rule("/metrics", "metrics", metrics_view)
+    app.before_request_funcs.setdefault(None, []).insert(0, _before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+
+    if enabled("EXT_SQLALCHEMY"):
+        _instrument_db(app)
+    if enabled("EXT_SOCKET") and _socket_metrics not in _collectors:
+        collector(_socket_metrics)
+
+    directory = app.config.get("METRICS_DIR")
+    if directory and _state["writer"] is None:
+        _state["dir"] = Path(directory)
+        _state["dir"].mkdir(parents=True, exist_ok=True)
+        (_state["dir"] / f"fpp-{os.getpid()}.json").unlink(missing_ok=True)
+        writer = Thread(target=_run_writer, args=(app.config.get("METRICS_FLUSH_INTERVAL", 5),),
+                        daemon=True, name="fpp-metrics")
+        _state["writer"] = writer
+        writer.start()
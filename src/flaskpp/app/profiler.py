@@ -0,0 +1,129 @@
+from flask import Flask, request, current_app
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from collections import Counter
+from pathlib import Path
+from threading import Thread, Lock, get_ident
+import sys, time, random, re
+
+from flaskpp.utils.debugger import log
+
+_active: dict[int, Counter] = {}
+_active_lock = Lock()
+_sampler = {"thread": None, "interval": 0.005}
+_write_lock = Lock()
+
+
+def _serializer(secret: str) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(secret, salt="fpp-profile")
+
+
+def profile_token(secret: str) -> str:
+    return _serializer(secret).dumps("profile")
+
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+def _sample():
+    while True:
+        with _active_lock:
+            if not _active:
+                _sampler["thread"] = None
+                return
+            targets = list(_active.items())
+
+        frames = sys._current_frames()
+        for ident, stacks in targets:
+            frame = frames.get(ident)
+            if frame is not None:
+                stacks[_collapse(frame)] += 1
+        del frames
+        time.sleep(_sampler["interval"])
+
+
+def start_profile(ident: int = None):
+    ident = ident or get_ident()
+    with _active_lock:
+        _active[ident] = Counter()
+        if _sampler["thread"] is None:
+            thread = Thread(target=_sample, daemon=True, name="fpp-profiler")
+            _sampler["thread"] = thread
+            thread.start()
+
+
+def stop_profile(ident: int = None) -> Counter:
+    with _active_lock:
+        return _active.pop(ident or get_ident(), Counter())
+
+
+def read_stacks(file: Path) -> Counter:
+    stacks = Counter()
+    if file.exists():
+        for line in file.read_text(encoding="utf-8").splitlines():
+            stack, _, count = line.rpartition(" ")
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+
+def write_stacks(file: Path, stacks: Counter, merge: bool = False):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    with _write_lock:
+        if merge:
+            stacks = read_stacks(file) + stacks
+        file.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()), encoding="utf-8")
+
+
+def _wanted() -> bool:
+    mode = current_app.config.get("PROFILING", "off")
+    if mode == "always":
+        return random.random() < current_app.config.get("PROFILE_RATE", 1.0)
+
+    token = request.headers.get("X-Fpp-Profile")
+    if not token:
+        return False
+    try:
+        _serializer(current_app.secret_key).loads(token, max_age=current_app.config.get("PROFILE_TOKEN_AGE", 3600))
+        return True
+    except BadSignature:
+        return False
+
+
+def _before_request():
+    if _wanted():
+        request.environ["fpp.profile"] = get_ident()
+        start_profile()
+
+
+def _teardown_request(_):
+    ident = request.environ.pop("fpp.profile", None)
+    if ident is None:
+        return
+
+    stacks = stop_profile(ident)
+    if not stacks:
+        return
+
+    endpoint = re.sub(r"[^a-zA-Z0-9_.-]", "_", request.endpoint or "unknown")
+    directory = Path(current_app.config.get("PROFILE_DIR", "profiles"))
+    if current_app.config.get("PROFILE_AGGREGATE", True):
+        write_stacks(directory / f"{endpoint}.collapsed", stacks, merge=True)
+    else:
+        write_stacks(directory / endpoint / f"{time.strftime('%Y%m%d-%H%M%S')}-{ident}.collapsed", stacks)
+
+
+def init_profiler(app: Flask):
+    mode = app.config.get("PROFILING", "off")
+    if mode not in ("header", "always"):
+        return
+
+    _sampler["interval"] = app.config.get("PROFILE_INTERVAL", 0.005)
+    app.before_request(_before_request)
+    app.teardown_request(_teardown_request)
+    log("info", f"Request profiling enabled ({mode}).")
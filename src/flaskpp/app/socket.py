@@ -1,13 +1,362 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+import asyncio, inspect
 
 default_handlers = {}
 
+_namespaces: dict[str, dict] = {
+    "/": {"handlers": default_handlers, "options": {}, "middleware": []},
+}
+_middleware: list[Callable] = []
+_routes: dict[str, dict[str, "SocketRoute"]] = {}
+_event_tables: dict[str, list[str]] = {}
+_event_versions: dict[str, int] = {}
 
-def default_event(name: str):
+_contexts: dict[str, list] = {}
+_semaphores: dict[tuple[str, str], asyncio.Semaphore] = {}
+_stats: dict[str, dict[str, dict[str, int]]] = {}
+_pool = {
+    "app": None,
+    "server": None,
+    "loop": None,
+    "request_context": True,
+    "compact_frames": False,
+    "executor": None,
+    "default_limit": 0,
+    "backlog": 0,
+}
+_pool_lock = Lock()
+_current: ContextVar[tuple[str | None, str]] = ContextVar("fpp_socket_current", default=(None, "/"))
+
+
+@dataclass
+class SocketRoute:
+    namespace: str
+    event: str
+    handler: Callable
+    hooks: tuple
+    limit: int
+    blocking: bool
+
+
+def _namespace(namespace: str) -> dict:
+    space = _namespaces.get(namespace)
+    if space is None:
+        space = _namespaces[namespace] = {"handlers": {}, "options": {}, "middleware": []}
+    return space
+
+
+def default_event(name: str, max_concurrency: int = None, namespace: str = "/", middleware: list = None):
     def decorator(func):
-        default_handlers[name] = func
+        space = _namespace(namespace)
+        space["handlers"][name] = func
+        space["options"][name] = (max_concurrency, tuple(middleware or ()))
+        _routes.pop(namespace, None)
+        _event_tables.pop(namespace, None)
+        _event_versions[namespace] = _event_versions.get(namespace, 0) + 1
         return func
     return decorator
 
 
+def socket_middleware(fn: Callable = None, namespace: str = None):
+    def decorator(func):
+        if namespace is None:
+            _middleware.append(func)
+            _routes.clear()
+        else:
+            _namespace(namespace)["middleware"].append(func)
+            _routes.pop(namespace, None)
+        return func
+    return decorator(fn) if fn else decorator
+
+
+def socket_namespaces() -> list[str]:
+    return list(_namespaces.keys())
+
+
+def event_table(namespace: str = "/") -> list[str]:
+    names = _event_tables.get(namespace)
+    if names is None:
+        names = _event_tables[namespace] = sorted(_namespace(namespace)["handlers"])
+    return names
+
+
+def event_version(namespace: str = "/") -> int:
+    return _event_versions.get(namespace, 0)
+
+
+def compact_frames() -> bool:
+    return _pool["compact_frames"]
+
+
+def decode_frame(data, namespace: str = "/") -> tuple[str, object]:
+    if isinstance(data, dict):
+        return data["event"], data.get("payload")
+
+    if not _pool["compact_frames"]:
+        raise SocketRejected("Compact socket frames are disabled.")
+    if not isinstance(data, (list, tuple)) or len(data) < 2:
+        raise SocketRejected("Malformed socket frame.")
+    if data[0] != event_version(namespace):
+        raise SocketRejected("Stale socket event table.")
+    names = event_table(namespace)
+    event_id = data[1]
+    if not isinstance(event_id, int) or not 0 <= event_id < len(names):
+        raise SocketRejected("Unknown socket event id.")
+    return names[event_id], data[2] if len(data) > 2 else None
+
+
 def no_handler(_):
     raise NotImplementedError("Socket event handler not found.")
+
+
+class SocketRejected(Exception):
+    pass
+
+
+def _build_route(namespace: str, event: str) -> SocketRoute:
+    space = _namespace(namespace)
+    handler = space["handlers"].get(event, no_handler)
+    limit, event_middleware = space["options"].get(event, (None, ()))
+    hooks = tuple(_middleware) + tuple(space["middleware"]) + tuple(event_middleware)
+    blocking = not inspect.iscoroutinefunction(handler) and not any(
+        inspect.iscoroutinefunction(hook) for hook in hooks
+    )
+    return SocketRoute(namespace, event, handler, hooks, limit or _pool["default_limit"], blocking)
+
+
+def build_routes() -> dict[str, dict[str, SocketRoute]]:
+    _routes.clear()
+    for namespace, space in _namespaces.items():
+        _routes[namespace] = {event: _build_route(namespace, event) for event in space["handlers"]}
+    return _routes
+
+
+def init_dispatch(app, server=None):
+    if _pool["executor"] is not None:
+        _pool["executor"].shutdown(wait=False)
+
+    _pool["app"] = app
+    _pool["server"] = server
+    _pool["loop"] = None
+    _pool["request_context"] = app.config.get("SOCKETIO_REQUEST_CONTEXT", True)
+    _pool["compact_frames"] = app.config.get("SOCKETIO_COMPACT_FRAMES", False)
+    _pool["executor"] = ThreadPoolExecutor(
+        max_workers=app.config.get("SOCKETIO_HANDLER_THREADS", 16),
+        thread_name_prefix="fpp-socket"
+    )
+    _pool["default_limit"] = app.config.get("SOCKETIO_EVENT_CONCURRENCY", 0)
+    _semaphores.clear()
+    _contexts.clear()
+    build_routes()
+
+
+def bind_loop(loop: asyncio.AbstractEventLoop = None):
+    if _pool["loop"] is None or _pool["loop"].is_closed():
+        _pool["loop"] = loop or asyncio.get_running_loop()
+
+
+def dispatch_stats() -> dict:
+    return {
+        "backlog": _pool["backlog"],
+        "namespaces": {
+            namespace: {event: dict(stats) for event, stats in events.items()}
+            for namespace, events in _stats.items()
+        },
+    }
+
+
+def _semaphore(route: SocketRoute) -> asyncio.Semaphore | None:
+    if not route.limit:
+        return None
+    key = (route.namespace, route.event)
+    semaphore = _semaphores.get(key)
+    if semaphore is None:
+        semaphore = _semaphores[key] = asyncio.Semaphore(route.limit)
+    return semaphore
+
+
+def _server_call(method: str, *args, **kwargs):
+    server = _pool["server"]
+    if server is None:
+        raise RuntimeError("Socket server is not initialized.")
+
+    result = getattr(server, method)(*args, **kwargs)
+    if not inspect.isawaitable(result):
+        return result
+    try:
+        asyncio.get_running_loop()
+        return result
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(result, _pool["loop"]).result()
+
+
+def join_room(sid: str, room: str, namespace: str = "/"):
+    return _server_call("enter_room", sid, room, namespace=namespace)
+
+
+def leave_room(sid: str, room: str, namespace: str = "/"):
+    return _server_call("leave_room", sid, room, namespace=namespace)
+
+
+def close_room(room: str, namespace: str = "/"):
+    return _server_call("close_room", room, namespace=namespace)
+
+
+def emit_room(room: str, event: str, data=None, namespace: str = "/", skip_sid: str = None):
+    return _server_call("emit", event, data, room=room, namespace=namespace, skip_sid=skip_sid)
+
+
+def current_sid() -> str | None:
+    return _current.get()[0]
+
+
+def current_namespace() -> str:
+    return _current.get()[1]
+
+
+def release_connection(sid: str):
+    _contexts.pop(sid, None)
+
+
+def _build_context(sid: str, namespace: str):
+    app = _pool["app"]
+    server = _pool["server"]
+    environ = server.get_environ(sid, namespace) if (server and _pool["request_context"]) else None
+    if not environ:
+        return app.app_context()
+
+    headers = [
+        (key[5:].replace("_", "-").title(), value)
+        for key, value in environ.items() if key.startswith("HTTP_")
+    ]
+    client = environ.get("asgi.scope", {}).get("client") or (environ.get("REMOTE_ADDR"), 0)
+    return app.test_request_context(
+        environ.get("PATH_INFO", "/"),
+        headers=headers,
+        environ_base={"REMOTE_ADDR": client[0]}
+    )
+
+
+@contextmanager
+def connection_context(sid: str = None, namespace: str = "/"):
+    token = _current.set((sid, namespace))
+    try:
+        with _connection_context(sid, namespace):
+            yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def _connection_context(sid: str, namespace: str):
+    app = _pool["app"]
+    if app is None:
+        yield
+        return
+    if sid is None:
+        with app.app_context():
+            yield
+        return
+
+    free = _contexts.setdefault(sid, [])
+    try:
+        ctx = free.pop()
+    except IndexError:
+        ctx = _build_context(sid, namespace)
+
+    if not hasattr(ctx, "request"):
+        ctx.g = app.app_ctx_globals_class()
+    ctx.push()
+    try:
+        yield
+    finally:
+        ctx.pop()
+        if _contexts.get(sid) is free:
+            free.append(ctx)
+
+
+def _apply_hooks(route: SocketRoute, sid: str, payload):
+    for hook in route.hooks:
+        result = hook(sid, route.event, payload)
+        if result is not None:
+            payload = result
+    return payload
+
+
+async def _apply_async_hooks(route: SocketRoute, sid: str, payload):
+    for hook in route.hooks:
+        result = hook(sid, route.event, payload)
+        if inspect.isawaitable(result):
+            result = await result
+        if result is not None:
+            payload = result
+    return payload
+
+
+def _run_sync(route: SocketRoute, payload, sid: str, hooks: bool = True):
+    with _pool_lock:
+        _pool["backlog"] -= 1
+
+    with connection_context(sid, route.namespace):
+        if hooks:
+            payload = _apply_hooks(route, sid, payload)
+        return route.handler(payload)
+
+
+async def _offload(route: SocketRoute, payload, sid: str, hooks: bool):
+    with _pool_lock:
+        _pool["backlog"] += 1
+    return await asyncio.get_running_loop().run_in_executor(_pool["executor"], _run_sync, route, payload, sid, hooks)
+
+
+async def _call(route: SocketRoute, payload, sid: str):
+    if route.blocking:
+        return await _offload(route, payload, sid, True)
+
+    with connection_context(sid, route.namespace):
+        payload = await _apply_async_hooks(route, sid, payload)
+        if inspect.iscoroutinefunction(route.handler):
+            return await route.handler(payload)
+    return await _offload(route, payload, sid, False)
+
+
+async def dispatch(event: str, payload, sid: str = None, namespace: str = "/"):
+    table = _routes.get(namespace)
+    if table is None:
+        table = _routes[namespace] = {}
+    route = table.get(event)
+    if route is None:
+        route = table[event] = _build_route(namespace, event)
+
+    stats = _stats.setdefault(namespace, {}).setdefault(
+        event, {"waiting": 0, "running": 0, "handled": 0, "failed": 0, "rejected": 0}
+    )
+    semaphore = _semaphore(route)
+
+    stats["waiting"] += 1
+    try:
+        if semaphore is not None:
+            await semaphore.acquire()
+    finally:
+        stats["waiting"] -= 1
+
+    stats["running"] += 1
+    try:
+        result = await _call(route, payload, sid)
+        stats["handled"] += 1
+        return result
+    except SocketRejected:
+        stats["rejected"] += 1
+        raise
+    except Exception:
+        stats["failed"] += 1
+        raise
+    finally:
+        stats["running"] -= 1
+        if semaphore is not None:
+            semaphore.release()
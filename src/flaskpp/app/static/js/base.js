@@ -1,4 +1,4 @@
-import { socket, emit } from "/fpp-static/js/socket.js";
+import { socket, emit, translate, translatePlural } from "/fpp-static/js/socket.js";
 
 
 function getFocusable(elem) {
@@ -155,23 +155,11 @@ export function safe_(fn, rethrow=false) {
 
 
 export async function _(key) {
-    return new Promise((resolve) => {
-        emit("_", key, (response) => {
-            resolve(response);
-        });
-    });
+    return translate(key);
 }
 
 export async function _n(singular, plural, count) {
-    return new Promise((resolve) => {
-        emit("_n", {
-            s: singular,
-            p: plural,
-            n: count
-        }, (response) => {
-            resolve(response);
-        });
-    });
+    return translatePlural(singular, plural, count);
 }
 
 
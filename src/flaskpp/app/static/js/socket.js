@@ -11,12 +11,249 @@ export function connectSocket() {
         timeout: 20000
     })
 }
+
+function eventFrames(sock) {
+    let table = null;
+    const negotiate = () => sock.emit('default_event', { event: "_events" }, response => {
+        table = response && Array.isArray(response.events)
+            ? { version: response.version, ids: new Map(response.events.map((name, id) => [name, id])) }
+            : null;
+    });
+    sock.on('connect', () => { table = null; negotiate(); });
+    if (sock.connected) negotiate();
+
+    return (event, data, callback) => {
+        if (!table?.ids.has(event)) {
+            sock.emit('default_event', { event: event, payload: data }, callback);
+            return;
+        }
+        sock.emit('default_event', [table.version, table.ids.get(event), data], response => {
+            if (response?.error === "Stale socket event table.") {
+                negotiate();
+                sock.emit('default_event', { event: event, payload: data }, callback);
+            } else if (callback) {
+                callback(response);
+            }
+        });
+    };
+}
+
 export let socket = connectSocket();
+const send = eventFrames(socket);
 
 
 export function emit(event, data=null, callback=null) {
-    socket.emit('default_event', {
-        event: event,
-        payload: data
-    }, callback);
-}
\ No newline at end of file
+    send(event, data, callback);
+}
+
+const namespaces = new Map();
+
+export function namespace(name) {
+    if (!namespaces.has(name)) {
+        const domain = socketScript.dataset.socketDomain || "";
+        const nsSocket = io(`${domain}${name}`, { transports: ['websocket'] });
+        namespaces.set(name, { socket: nsSocket, send: eventFrames(nsSocket) });
+    }
+    const { socket: nsSocket, send: nsSend } = namespaces.get(name);
+    return {
+        socket: nsSocket,
+        emit(event, data=null, callback=null) {
+            nsSend(event, data, callback);
+        },
+        on(event, handler) {
+            nsSocket.on(event, handler);
+        }
+    };
+}
+
+const translationLocale = document.documentElement.lang || "default";
+const translationStore = `fpp_i18n:${translationLocale}`;
+const translations = new Map(Object.entries(
+    JSON.parse(sessionStorage.getItem(translationStore) || "{}")
+));
+let translationBatch = null;
+
+const pluralToken = /\s*(\d+|n|&&|\|\||[=!<>]=|[-+*\/%!<>?:()])\s*/y;
+const pluralLevels = [["||"], ["&&"], ["==", "!="], ["<", ">", "<=", ">="], ["+", "-"], ["*", "/", "%"]];
+const pluralOps = {
+    "||": (a, b) => Number(Boolean(a) || Boolean(b)),
+    "&&": (a, b) => Number(Boolean(a) && Boolean(b)),
+    "==": (a, b) => Number(a === b),
+    "!=": (a, b) => Number(a !== b),
+    "<": (a, b) => Number(a < b),
+    ">": (a, b) => Number(a > b),
+    "<=": (a, b) => Number(a <= b),
+    ">=": (a, b) => Number(a >= b),
+    "+": (a, b) => a + b,
+    "-": (a, b) => a - b,
+    "*": (a, b) => a * b,
+    "/": (a, b) => Math.trunc(a / b),
+    "%": (a, b) => a % b,
+};
+
+// Compiles a gettext plural expression without eval, so the bundle works under a strict CSP.
+function compilePlural(source) {
+    const tokens = [];
+    for (let pos = 0; pos < source.length; pos = pluralToken.lastIndex) {
+        pluralToken.lastIndex = pos;
+        const match = pluralToken.exec(source);
+        if (!match) throw new SyntaxError(`Invalid plural rule: ${source}`);
+        tokens.push(match[1]);
+    }
+
+    let idx = 0;
+    const expect = (token) => {
+        if (tokens[idx++] !== token) throw new SyntaxError(`Invalid plural rule: ${source}`);
+    };
+
+    function ternary() {
+        const condition = binary(0);
+        if (tokens[idx] !== "?") return condition;
+        idx++;
+        const then = ternary();
+        expect(":");
+        const otherwise = ternary();
+        return n => condition(n) ? then(n) : otherwise(n);
+    }
+
+    function binary(level) {
+        if (level === pluralLevels.length) return unary();
+        let left = binary(level + 1);
+        while (pluralLevels[level].includes(tokens[idx])) {
+            const op = pluralOps[tokens[idx++]], lhs = left, rhs = binary(level + 1);
+            left = n => op(lhs(n), rhs(n));
+        }
+        return left;
+    }
+
+    function unary() {
+        const token = tokens[idx++];
+        if (token === "!") {
+            const operand = unary();
+            return n => Number(!operand(n));
+        }
+        if (token === "n") return n => n;
+        if (token === "(") {
+            const inner = ternary();
+            expect(")");
+            return inner;
+        }
+        if (/^\d+$/.test(token ?? "")) {
+            const value = Number(token);
+            return () => value;
+        }
+        throw new SyntaxError(`Invalid plural rule: ${source}`);
+    }
+
+    const rule = ternary();
+    if (idx !== tokens.length) throw new SyntaxError(`Invalid plural rule: ${source}`);
+    return n => Number(rule(n));
+}
+
+function pluralRule(source) {
+    try {
+        return compilePlural(String(source));
+    } catch (e) {
+        console.warn(e.message);
+        return n => Number(n !== 1);
+    }
+}
+
+const bundleMeta = document.querySelector('meta[name="fpp-i18n"]');
+const translationBundle = bundleMeta
+    ? fetch(bundleMeta.content)
+        .then(response => response.ok ? response.json() : null)
+        .then(bundle => {
+            if (bundle) bundle.pluralIndex = pluralRule(bundle.plural);
+            return bundle;
+        })
+        .catch(() => null)
+    : Promise.resolve(null);
+
+function lookupBundle(bundle, key, plural) {
+    if (!bundle) return undefined;
+    if (!plural) return bundle.messages[key];
+
+    const [singular, pluralText, count] = plural;
+    const override = bundle.messages[count !== 1 ? pluralText : singular];
+    if (override !== undefined) return override;
+    return bundle.plurals[singular]?.[bundle.pluralIndex(count)] ?? undefined;
+}
+
+function pluralKey(singular, plural, count) {
+    return `${singular}\u0000${plural}\u0000${count}`;
+}
+
+function persistTranslations() {
+    try {
+        sessionStorage.setItem(translationStore, JSON.stringify(Object.fromEntries(translations)));
+    } catch (e) {
+        console.warn("Failed to persist translations:", e);
+    }
+}
+
+const translationBatchLimit = 256;
+
+function flushTranslations() {
+    const batch = translationBatch;
+    if (!batch) return;
+    translationBatch = null;
+
+    const keys = [...batch.keys.keys()];
+    const plurals = [...batch.plurals.values()].map(entry => entry.args);
+
+    emit("_batch", { keys: keys, plurals: plurals }, (response) => {
+        const failed = !response || response.error;
+        if (failed) console.warn("Failed to fetch translations:", response?.error);
+
+        const result = failed ? {} : response.keys ?? {};
+        keys.forEach(key => {
+            const text = result[key];
+            if (text != null) translations.set(key, text);
+            batch.keys.get(key).forEach(resolve => resolve(text ?? key));
+        });
+
+        const pluralResult = failed ? [] : response.plurals ?? [];
+        [...batch.plurals.entries()].forEach(([key, entry], idx) => {
+            const [singular, plural, count] = entry.args;
+            const text = pluralResult[idx];
+            if (text != null) translations.set(key, text);
+            entry.resolvers.forEach(resolve => resolve(text ?? (count === 1 ? singular : plural)));
+        });
+
+        if (!failed) persistTranslations();
+    });
+}
+
+async function queueTranslation(key, plural=null) {
+    if (translations.has(key)) return translations.get(key);
+
+    const bundled = lookupBundle(await translationBundle, key, plural);
+    if (bundled !== undefined) return bundled;
+
+    if (!translationBatch) {
+        translationBatch = { keys: new Map(), plurals: new Map() };
+        queueMicrotask(flushTranslations);
+    }
+
+    return new Promise((resolve) => {
+        if (plural) {
+            const entry = translationBatch.plurals.get(key) ?? { args: plural, resolvers: [] };
+            entry.resolvers.push(resolve);
+            translationBatch.plurals.set(key, entry);
+        } else {
+            const resolvers = translationBatch.keys.get(key) ?? [];
+            resolvers.push(resolve);
+            translationBatch.keys.set(key, resolvers);
+        }
+        if (translationBatch.keys.size + translationBatch.plurals.size >= translationBatchLimit) flushTranslations();
+    });
+}
+
+export function translate(key) {
+    return queueTranslation(key);
+}
+
+export function translatePlural(singular, plural, count) {
+    return queueTranslation(pluralKey(singular, plural, count), [singular, plural, count]);
+}
@@ -0,0 +1,175 @@
+from flask import Flask
+from threading import Thread, Event, Lock
+from queue import Queue, Empty
+from uuid import uuid4
+import json
+
+from flaskpp.app.data.babel import on_invalidate, drop_catalog, drop_catalogs
+from flaskpp.utils.debugger import log, exception
+
+_origin = uuid4().hex
+_state = {
+    "client": None,
+    "channel": None,
+    "listener": None,
+}
+_stop = Event()
+_seen: dict[tuple[str, str, str], int] = {}
+
+
+class LocalPubSub:
+    def __init__(self, broker: "LocalBroker"):
+        self._broker = broker
+        self._queue = Queue()
+        self._channels = set()
+
+    def subscribe(self, *channels):
+        self._channels.update(channels)
+        self._broker.attach(self)
+
+    def deliver(self, channel: str, data: bytes):
+        if channel in self._channels:
+            self._queue.put({"type": "message", "channel": channel, "data": data})
+
+    def get_message(self, ignore_subscribe_messages: bool = True, timeout: float = 0.0):
+        try:
+            return self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+        except Empty:
+            return None
+
+    def close(self):
+        self._broker.detach(self)
+
+
+class LocalBroker:
+    def __init__(self):
+        self._subscribers: list[LocalPubSub] = []
+        self._lock = Lock()
+
+    def attach(self, pubsub: LocalPubSub):
+        with self._lock:
+            if pubsub not in self._subscribers:
+                self._subscribers.append(pubsub)
+
+    def detach(self, pubsub: LocalPubSub):
+        with self._lock:
+            if pubsub in self._subscribers:
+                self._subscribers.remove(pubsub)
+
+    def publish(self, channel: str, message: str | bytes) -> int:
+        data = message.encode() if isinstance(message, str) else message
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for pubsub in subscribers:
+            pubsub.deliver(channel, data)
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = True) -> LocalPubSub:
+        return LocalPubSub(self)
+
+
+local_broker = LocalBroker()
+
+
+def connect(url: str):
+    if url.startswith("memory://"):
+        return local_broker
+    if url.startswith("fakeredis://"):
+        import fakeredis
+        return fakeredis.FakeStrictRedis()
+    import redis
+    return redis.Redis.from_url(url)
+
+
+def _handle(raw: bytes | str):
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        message = None
+    if (not isinstance(message, dict) or not isinstance(message.get("locale"), str)
+            or not isinstance(message.get("domain", "messages"), str)):
+        log("warn", f"Ignoring malformed i18n invalidation: {raw!r}")
+        return
+
+    origin, domain, locale = message.get("origin"), message.get("domain", "messages"), message["locale"]
+    if origin == _origin:
+        return
+
+    version = message.get("version")
+    if isinstance(version, int):
+        slot = (origin, domain, locale)
+        if version <= _seen.get(slot, 0):
+            return
+        _seen[slot] = version
+    drop_catalog(locale, domain)
+
+
+def _listen(client, channel: str):
+    backoff = 1
+    while not _stop.is_set():
+        pubsub = None
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+            drop_catalogs()
+            backoff = 1
+            while not _stop.is_set():
+                message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message.get("type") == "message":
+                    _handle(message["data"])
+        except Exception as e:
+            exception(e, f"i18n sync listener lost its connection, retrying in {backoff}s.")
+            _stop.wait(backoff)
+            backoff = min(backoff * 2, 30)
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+
+@on_invalidate
+def _publish(locale: str, domain: str, version: int):
+    client = _state["client"]
+    if client is None:
+        return
+
+    message = json.dumps({
+        "origin": _origin,
+        "domain": domain,
+        "locale": locale,
+        "version": version,
+    })
+    try:
+        client.publish(_state["channel"], message)
+    except Exception as e:
+        exception(e, f"Failed to publish i18n invalidation for {domain}/{locale}.")
+
+
+def init_sync(app: Flask, client=None, listen: bool = True):
+    if _state["listener"] is not None or _state["client"] is not None:
+        return
+
+    url = app.config.get("BABEL_SYNC_URL") or "memory://"
+    client = client or connect(url)
+    channel = app.config.get("BABEL_SYNC_CHANNEL", "fpp:i18n:invalidate")
+
+    _stop.clear()
+    _state["client"] = client
+    _state["channel"] = channel
+    if not listen:
+        return
+
+    listener = Thread(target=_listen, args=(client, channel), daemon=True, name="fpp-i18n-sync")
+    _state["listener"] = listener
+    listener.start()
+    log("info", f"Listening for i18n invalidations on '{channel}'.")
+
+
+def stop_sync():
+    listener = _state["listener"]
+    _stop.set()
+    if listener is not None:
+        listener.join(timeout=5)
+    _state.update(client=None, channel=None, listener=None)
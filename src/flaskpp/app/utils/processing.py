@@ -1,10 +1,13 @@
-from flask import request, render_template, url_for
+from flask import request, render_template, url_for, current_app
 from werkzeug.exceptions import NotFound
 from markupsafe import Markup
+import json, random, time
 
 from flaskpp.app.utils.translating import get_locale
 from flaskpp.app.utils.auto_nav import nav_links
-from flaskpp.app.socket import default_handlers, no_handler
+from flaskpp.app.utils.socket_flow import allow_event, release_flow
+from flaskpp.app.socket import (dispatch, release_connection, decode_frame, event_table, event_version,
+                                compact_frames, bind_loop, SocketRejected)
 from flaskpp.utils import random_code, enabled
 from flaskpp.utils.debugger import log, exception
 
@@ -34,6 +37,10 @@ def before_request(fn):
 
 @before_request
 def _before_request():
+    request.environ["fpp.start"] = time.monotonic()
+    if current_app.config.get("ACCESS_LOG") == "json":
+        return
+
     method = request.method.upper()
     path = request.path
     ip = request.remote_addr
@@ -49,9 +56,33 @@ def after_request(fn):
 
 @after_request
 def _after_request(response):
+    if current_app.config.get("ACCESS_LOG") == "json":
+        access_log(response)
     return response
 
 
+def access_log(response):
+    start = request.environ.get("fpp.start")
+    blueprint = request.blueprint
+    status = response.status_code
+
+    sampling = current_app.config.get("ACCESS_LOG_SAMPLING") or {}
+    rate = sampling.get(blueprint or "", sampling.get("*", 1.0))
+    if status < 500 and rate < 1 and random.random() >= rate:
+        return
+
+    log("access", json.dumps({
+        "method": request.method,
+        "path": request.path,
+        "status": status,
+        "duration_ms": round((time.monotonic() - start) * 1000, 3) if start else None,
+        "blueprint": blueprint,
+        "endpoint": request.endpoint,
+        "bytes": response.content_length,
+        "ip": request.remote_addr,
+    }, separators=(",", ":")))
+
+
 def handle_app_error(fn):
     handlers["handle_app_error"] = fn
     return fn
@@ -71,18 +102,44 @@ def socket_event_handler(fn):
     return fn
 
 @socket_event_handler
-def _socket_event_handler(sid: str, data: dict):
-    event = data["event"]
-    payload = data.get("payload")
-    log("request", f"Socket event from {sid}: {event} - With data: {payload}")
+async def _socket_event_handler(sid: str, data: dict | list, namespace: str = "/"):
+    if not allow_event(sid):
+        return { "error": "Too many socket events." }
 
-    handler = default_handlers.get(event, no_handler)
     try:
-        return handler(payload)
+        event, payload = decode_frame(data, namespace)
+        if event == "_events":
+            if not compact_frames():
+                return { "events": None }
+            return { "events": event_table(namespace), "version": event_version(namespace) }
+
+        log("request", f"Socket event from {sid} on {namespace}: {event} - With data: {payload}")
+        return await dispatch(event, payload, sid, namespace)
+    except SocketRejected as e:
+        return { "error": str(e) or "Socket event rejected." }
     except Exception as e:
         return handlers["handle_socket_error"](e)
 
 
+def socket_connect_handler(fn):
+    handlers["socket_connect_handler"] = fn
+    return fn
+
+@socket_connect_handler
+def _socket_connect_handler(sid: str, *_):
+    bind_loop()
+
+
+def socket_disconnect_handler(fn):
+    handlers["socket_disconnect_handler"] = fn
+    return fn
+
+@socket_disconnect_handler
+def _socket_disconnect_handler(sid: str, *_):
+    release_connection(sid)
+    release_flow(sid)
+
+
 def handle_socket_error(fn):
     handlers["handle_socket_error"] = fn
     return fn
@@ -0,0 +1,162 @@
+from flask import Flask
+import asyncio, time
+
+from flaskpp.utils.debugger import log
+
+_settings = {
+    "rate": 0.0,
+    "burst": 0.0,
+    "high_water": 0,
+    "low_water": 0,
+    "policy": "drop",
+    "timeout": 10.0,
+    "interval": 0.05,
+}
+_buckets: dict[str, list[float]] = {}
+_outboxes: dict[tuple[str, str], "Outbox"] = {}
+_counters = {
+    "allowed": 0,
+    "limited": 0,
+    "sent": 0,
+    "dropped": 0,
+    "coalesced": 0,
+    "evicted": 0,
+}
+
+
+class Outbox:
+    def __init__(self):
+        self.pending: dict[str, object] = {}
+        self.over_since: float | None = None
+        self.flusher: asyncio.Task | None = None
+
+
+def init_flow(app: Flask):
+    high_water = app.config.get("SOCKETIO_OUTBOUND_HIGH_WATER", 0)
+    _settings.update(
+        rate=float(app.config.get("SOCKETIO_RATE_LIMIT", 0)),
+        burst=float(app.config.get("SOCKETIO_RATE_BURST", 0) or app.config.get("SOCKETIO_RATE_LIMIT", 0)),
+        high_water=high_water,
+        low_water=app.config.get("SOCKETIO_OUTBOUND_LOW_WATER", high_water // 2),
+        policy=app.config.get("SOCKETIO_OUTBOUND_POLICY", "drop"),
+        timeout=float(app.config.get("SOCKETIO_SLOW_CONSUMER_TIMEOUT", 10)),
+    )
+    _buckets.clear()
+    _outboxes.clear()
+
+
+def flow_stats() -> dict:
+    return {
+        **_counters,
+        "backlogged": sum(1 for outbox in _outboxes.values() if outbox.over_since is not None),
+    }
+
+
+def allow_event(sid: str) -> bool:
+    rate = _settings["rate"]
+    if not rate:
+        return True
+
+    now = time.monotonic()
+    bucket = _buckets.get(sid)
+    if bucket is None:
+        bucket = _buckets[sid] = [_settings["burst"], now]
+    else:
+        bucket[0] = min(_settings["burst"], bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+
+    if bucket[0] < 1:
+        _counters["limited"] += 1
+        return False
+    bucket[0] -= 1
+    _counters["allowed"] += 1
+    return True
+
+
+def release_flow(sid: str):
+    _buckets.pop(sid, None)
+    for key in [key for key in _outboxes if key[0] == sid]:
+        outbox = _outboxes.pop(key)
+        if outbox.flusher is not None:
+            outbox.flusher.cancel()
+
+
+def _backlog(server, sid: str, namespace: str) -> int:
+    eio_sid = server.manager.eio_sid_from_sid(sid, namespace)
+    socket = server.eio.sockets.get(eio_sid) if eio_sid else None
+    return socket.queue.qsize() if socket is not None else 0
+
+
+async def _evict(server, sid: str, namespace: str):
+    _counters["evicted"] += 1
+    log("warn", f"Disconnecting slow socket consumer {sid} on {namespace}.")
+    _outboxes.pop((sid, namespace), None)
+    await server.disconnect(sid, namespace=namespace)
+
+
+async def _drain(server, sid: str, namespace: str, outbox: Outbox):
+    while outbox.pending:
+        await asyncio.sleep(_settings["interval"])
+        if _backlog(server, sid, namespace) > _settings["low_water"]:
+            if time.monotonic() - outbox.over_since > _settings["timeout"]:
+                await _evict(server, sid, namespace)
+                return
+            continue
+
+        pending, outbox.pending = outbox.pending, {}
+        outbox.over_since = None
+        for event, data in pending.items():
+            await server.emit(event, data, to=sid, namespace=namespace)
+            _counters["sent"] += 1
+
+
+async def send(sid: str, event: str, data=None, namespace: str = "/", policy: str = None) -> bool:
+    from flaskpp.app.socket import _pool
+    server = _pool["server"]
+    if server is None:
+        raise RuntimeError("Socket server is not initialized.")
+
+    high_water = _settings["high_water"]
+    if not high_water:
+        await server.emit(event, data, to=sid, namespace=namespace)
+        _counters["sent"] += 1
+        return True
+
+    key = (sid, namespace)
+    outbox = _outboxes.get(key)
+    if outbox is None:
+        outbox = _outboxes[key] = Outbox()
+
+    if not outbox.pending and _backlog(server, sid, namespace) < high_water:
+        outbox.over_since = None
+        await server.emit(event, data, to=sid, namespace=namespace)
+        _counters["sent"] += 1
+        return True
+
+    now = time.monotonic()
+    if outbox.over_since is None:
+        outbox.over_since = now
+    elif now - outbox.over_since > _settings["timeout"]:
+        await _evict(server, sid, namespace)
+        return False
+
+    if (policy or _settings["policy"]) == "coalesce":
+        if event in outbox.pending:
+            _counters["coalesced"] += 1
+        outbox.pending[event] = data
+        if outbox.flusher is None or outbox.flusher.done():
+            outbox.flusher = asyncio.ensure_future(_drain(server, sid, namespace, outbox))
+        return True
+
+    _counters["dropped"] += 1
+    return False
+
+
+async def send_room(room: str, event: str, data=None, namespace: str = "/", policy: str = None) -> int:
+    from flaskpp.app.socket import _pool
+    server = _pool["server"]
+    delivered = 0
+    for sid, _ in list(server.manager.get_participants(namespace, room)):
+        if await send(sid, event, data, namespace, policy):
+            delivered += 1
+    return delivered
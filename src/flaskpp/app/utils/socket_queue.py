@@ -0,0 +1,180 @@
+from flask import Flask
+from socketio import AsyncRedisManager
+from socketio.async_pubsub_manager import AsyncPubSubManager
+from threading import Thread, Lock
+import asyncio
+
+from flaskpp.utils.debugger import log, exception
+
+_state = {
+    "url": None,
+    "channel": "flaskpp-socketio",
+    "server": None,
+    "writer": None,
+    "writer_loop": None,
+}
+_writer_lock = Lock()
+
+
+class _BatchedPublish:
+    batch_size = 64
+    interval = 0.005
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._outbox = []
+        self._flusher = None
+
+    async def _publish(self, data):
+        self._outbox.append(data)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._flush())
+
+    async def _flush(self):
+        await asyncio.sleep(self.interval)
+        outbox = self._outbox
+        while outbox:
+            batch = outbox[:self.batch_size]
+            del outbox[:self.batch_size]
+            try:
+                await super()._publish(batch[0] if len(batch) == 1 else batch)
+            except Exception as e:
+                exception(e, f"Failed to publish {len(batch)} socket messages.")
+
+    async def flush(self):
+        if self._flusher is not None:
+            await self._flusher
+
+    async def _listen(self):
+        async for message in super()._listen():
+            if not isinstance(message, dict):
+                try:
+                    message = self.json.loads(message)
+                except (TypeError, ValueError):
+                    continue
+            if isinstance(message, list):
+                for item in message:
+                    yield item
+            else:
+                yield message
+
+
+class BatchedRedisManager(_BatchedPublish, AsyncRedisManager):
+    def _redis_connect(self):
+        if not self.redis_url.startswith("fakeredis://"):
+            return super()._redis_connect()
+        from fakeredis import aioredis
+        self.redis = aioredis.FakeRedis()
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.connected = True
+
+
+class LocalQueue:
+    def __init__(self):
+        self._subscribers: dict[str, list[tuple]] = {}
+        self._lock = Lock()
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers[channel] = [s for s in self._subscribers.get(channel, []) if s[1] is not queue]
+
+    def publish(self, channel: str, data) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, []))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, data)
+        return len(subscribers)
+
+
+local_queue = LocalQueue()
+
+
+class _LocalManager(AsyncPubSubManager):
+    name = "local"
+
+    async def _publish(self, data):
+        return local_queue.publish(self.channel, self.json.dumps(data))
+
+    async def _listen(self):
+        queue = local_queue.subscribe(self.channel)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            local_queue.unsubscribe(self.channel, queue)
+
+
+class LocalQueueManager(_BatchedPublish, _LocalManager):
+    pass
+
+
+def queue_manager(url: str, channel: str = "flaskpp-socketio", write_only: bool = False,
+                  batch_size: int = None, interval: float = None) -> AsyncPubSubManager:
+    if url.startswith("memory://"):
+        manager = LocalQueueManager(channel=channel, write_only=write_only)
+    else:
+        manager = BatchedRedisManager(url, channel=channel, write_only=write_only)
+
+    if batch_size:
+        manager.batch_size = batch_size
+    if interval is not None:
+        manager.interval = interval
+    return manager
+
+
+def init_queue(app: Flask, server) -> AsyncPubSubManager | None:
+    url = app.config.get("SOCKETIO_MESSAGE_QUEUE")
+    if not url:
+        return None
+
+    channel = app.config.get("SOCKETIO_QUEUE_CHANNEL", "flaskpp-socketio")
+    manager = queue_manager(
+        url, channel,
+        batch_size=app.config.get("SOCKETIO_PUBLISH_BATCH", 64),
+        interval=app.config.get("SOCKETIO_PUBLISH_INTERVAL", 0.005)
+    )
+    manager.set_server(server)
+    server.manager = manager
+    server.manager_initialized = False
+
+    _state.update(url=url, channel=channel, server=server, writer=None)
+    log("info", f"Socket events are shared through '{channel}'.")
+    return manager
+
+
+def _writer():
+    with _writer_lock:
+        if _state["writer"] is None:
+            loop = asyncio.new_event_loop()
+            Thread(target=loop.run_forever, daemon=True, name="fpp-socket-writer").start()
+            _state["writer_loop"] = loop
+            _state["writer"] = queue_manager(_state["url"], _state["channel"], write_only=True)
+    return _state["writer"], _state["writer_loop"]
+
+
+def broadcast(event: str, data=None, room: str = None, namespace: str = "/", skip_sid: str = None):
+    from flaskpp.app.socket import _pool
+
+    server = _state["server"] or _pool["server"]
+    loop = _pool["loop"]
+    if server is not None and loop is not None and loop.is_running():
+        emitter = server
+    else:
+        if _state["url"] is None:
+            raise RuntimeError("Socket server is not running and SOCKETIO_MESSAGE_QUEUE is not configured.")
+        emitter, loop = _writer()
+
+    coro = emitter.emit(event, data, room=room, namespace=namespace, skip_sid=skip_sid)
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        return loop.create_task(coro)
+    return asyncio.run_coroutine_threadsafe(coro, loop)
@@ -2,9 +2,11 @@ from flask import (current_app, has_app_context, has_request_context,
                    request, Response, make_response, redirect)
 from urllib.parse import urlparse, urljoin
 
-from ..socket import default_event
+from ..socket import default_event, SocketRejected
 from ...utils import enabled
 
+BATCH_LIMIT = 256
+
 
 def _t(s: str) -> str:
     return s
@@ -89,3 +91,26 @@ def socket_tn(data: dict):
         data.get("p", ""),
         data.get("n", 0)
     )
+
+
+@default_event("_batch")
+def socket_t_batch(data: dict):
+    if not isinstance(data, dict):
+        raise SocketRejected("Malformed translation batch.")
+    keys = data.get("keys") or []
+    plurals = data.get("plurals") or []
+    if not isinstance(keys, list) or not isinstance(plurals, list):
+        raise SocketRejected("Malformed translation batch.")
+    if len(keys) + len(plurals) > BATCH_LIMIT:
+        raise SocketRejected(f"Translation batch exceeds {BATCH_LIMIT} entries.")
+    return {
+        "locale": get_locale() if has_app_context() else None,
+        "keys": {key: t(key) for key in keys if isinstance(key, str)},
+        "plurals": [tn(*entry) if _plural_entry(entry) else None for entry in plurals]
+    }
+
+
+def _plural_entry(entry) -> bool:
+    return (isinstance(entry, list) and len(entry) == 3
+            and isinstance(entry[0], str) and isinstance(entry[1], str)
+            and isinstance(entry[2], int) and not isinstance(entry[2], bool))
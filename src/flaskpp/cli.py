@@ -5,12 +5,14 @@ import typer, os, subprocess, sys
 from flaskpp.modules.cli import modules_entry
 from flaskpp.utils.setup import setup
 from flaskpp.utils.run import run
+from flaskpp.utils.build import build
 from flaskpp.utils.service_registry import registry_entry
 from flaskpp.tailwind import setup_tailwind
 from flaskpp.fpp_node import load_node
 from flaskpp.fpp_node.vite import prepare_vite
 from flaskpp.fpp_node.cli import node_entry
 from flaskpp.tailwind.cli import tailwind_entry
+from flaskpp.app.cli import i18n_entry, profile_entry, startup_report
 
 app = typer.Typer(help="Flask++ CLI")
 cli_home = Path(__file__).parent
@@ -43,11 +45,15 @@ def main_callback(
             "\t-h, --help\t   - Show this help message.\n\n"
             "Commands:\n\tinit\t\t   - Creates the Flask++ basic structure in the current working directory.\n"
             "\tsetup\t\t   - Starts the Flask++ app setup tool. (Can be run multiple times.)\n"
-            "\trun\t\t   - The Flask++ native app control. (Using uvicorn.)\n\n"
+            "\trun\t\t   - The Flask++ native app control. (Using uvicorn.)\n"
+            "\tbuild\t\t   - Builds tailwind and all frontends of an app ahead of time into builds/. (" + typer.style("fpp build -a [app]", bold=True) + ")\n"
+            "\tstartup-report\t   - Boots an app once and shows how long each startup phase took. (" + typer.style("fpp startup-report -a [app]", bold=True) + ")\n\n"
             "Sub-CLIs:\n\tmodules\t\t   - Manages the modules of Flask++ apps.\n"
             "\tregistry\t   - Manages the app service registry for you. (Requires admin privileges.)\n"
             "\tnode\t\t   - Allows you to run node commands with the standalone node cli. (" + typer.style("fpp node [npm/npx] [args]", bold=True) + ")\n"
             "\ttailwind\t   - Allows you to use the natively integrated tailwind cli.\n"
+            "\ti18n\t\t   - Bulk imports / exports the translations of your i18n database.\n"
+            "\tprofile\t\t   - Lists, diffs and authorizes request profiles. (" + typer.style("fpp profile [list/diff/token]", bold=True) + ")\n"
             "\t" + typer.style("To use node and tailwind, you need to run ", fg=typer.colors.MAGENTA)
                  + typer.style("fpp init", bold=True, fg=typer.colors.MAGENTA)
                  + typer.style(" at least one time before.", fg=typer.colors.MAGENTA) + "\n\n" +
@@ -80,7 +86,13 @@ def main_callback(
             "\t-p, --port\t   - The port on which your apps service should run. (Default is 5000.)\n"
             "\t-d, --debug\t   - If your service should run in debug mode.\n\n" +
             typer.style("fpp registry [remove/start/stop] [name]", bold=True) + "\n"
-            "\tname\t\t   - The name of the app (which - of course - also is the service name)."
+            "\tname\t\t   - The name of the app (which - of course - also is the service name).\n\n\n" +
+            typer.style("fpp i18n [import/export] [file] [args]", bold=True) + "\n"
+            "\tfile\t\t   - A .po, .csv, .json or .jsonl file to import from or export to.\n"
+            "\t-a, --app\t   - The app whose database should be used.\n"
+            "\t-l, --locale\t   - The locale of the translations. (Required for .po files.)\n"
+            "\t-d, --domain\t   - The translation domain. (Default is messages.)\n"
+            "\t-b, --batch-size   - How many rows are written per statement. (Default is 1000.)"
         )
         raise typer.Exit()
 
@@ -148,6 +160,9 @@ app = create_app().to_asgi()
 @source not "../../venv";
 @source not "../../vite";
 @source not "../../modules";
+@source not "../../instance";
+@source not "../../migrations";
+@source not "../../builds";
 
 @theme {
     /* ... */
@@ -197,6 +212,8 @@ app = create_app().to_asgi()
 
 app.command()(setup)
 app.command()(run)
+app.command()(build)
+app.command("startup-report")(startup_report)
 
 
 def main():
@@ -204,6 +221,8 @@ def main():
     registry_entry(app)
     node_entry(app)
     tailwind_entry(app)
+    i18n_entry(app)
+    profile_entry(app)
     app()
 
 
@@ -0,0 +1,289 @@
+import asyncio, base64, hashlib, os, struct, h11
+
+_hop_headers = {b"connection", b"keep-alive", b"proxy-authenticate", b"proxy-authorization", b"te", b"trailer",
+                b"transfer-encoding", b"upgrade", b"host"}
+_ws_headers = _hop_headers | {b"sec-websocket-key", b"sec-websocket-version", b"sec-websocket-extensions",
+                              b"sec-websocket-protocol", b"sec-websocket-accept"}
+_ws_guid = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketProtocolError(Exception):
+    pass
+
+
+def _forward_headers(headers, skip: set = _hop_headers) -> list[tuple[bytes, bytes]]:
+    connection = b",".join(value for name, value in headers if name.lower() == b"connection")
+    listed = {token.strip().lower() for token in connection.split(b",") if token.strip()}
+    return [(name, value) for name, value in headers if name.lower() not in skip and name.lower() not in listed]
+
+
+def _mask(payload: bytes, mask: bytes) -> bytes:
+    if not payload:
+        return b""
+    key = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(len(payload), "big")
+
+
+def _frame(opcode: int, payload: bytes, masked: bool = True) -> bytes:
+    length, flag = len(payload), 0x80 if masked else 0
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, flag | length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, flag | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, flag | 127, length)
+    if not masked:
+        return header + payload
+    mask = os.urandom(4)
+    return header + mask + _mask(payload, mask)
+
+
+def _accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1(key.encode() + _ws_guid).digest()).decode()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> tuple[bool, int, bytes]:
+    first, second = await reader.readexactly(2)
+    if first & 0x70:
+        raise WebSocketProtocolError("Reserved bits set without a negotiated extension.")
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    return bool(first & 0x80), first & 0x0F, _mask(payload, mask) if mask else payload
+
+
+class _Upstream:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader, self.writer = reader, writer
+        self.http = h11.Connection(h11.CLIENT)
+
+    def send(self, event):
+        data = self.http.send(event)
+        if data:
+            self.writer.write(data)
+
+    async def next_event(self):
+        while True:
+            event = self.http.next_event()
+            if event is not h11.NEED_DATA:
+                return event
+            self.http.receive_data(await self.reader.read(65536))
+
+    def close(self):
+        self.writer.close()
+
+
+class UpstreamPool:
+    def __init__(self, host: str = "localhost", size: int = 16):
+        self.host, self.size = host, size
+        self._idle: dict[int, list[_Upstream]] = {}
+
+    async def acquire(self, port: int) -> tuple[_Upstream, bool]:
+        idle = self._idle.get(port)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        reader, writer = await asyncio.open_connection(self.host, port)
+        return _Upstream(reader, writer), False
+
+    def release(self, port: int, conn: _Upstream):
+        if conn.http.our_state is h11.DONE and conn.http.their_state is h11.DONE:
+            conn.http.start_next_cycle()
+            idle = self._idle.setdefault(port, [])
+            if len(idle) < self.size:
+                idle.append(conn)
+                return
+        conn.close()
+
+
+async def _error(send, status: int, message: bytes):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"text/plain"), (b"content-length", str(len(message)).encode())]})
+    await send({"type": "http.response.body", "body": message})
+
+
+class ViteDevProxy:
+    def __init__(self, app, servers: dict[str, int], pool: UpstreamPool = None):
+        self.app, self.servers = app, servers
+        self.pool = pool or UpstreamPool()
+
+    def _match(self, path: str) -> int | None:
+        for prefix in sorted(self.servers, key=len, reverse=True):
+            if path == prefix or path.startswith(f"{prefix}/"):
+                return self.servers[prefix]
+        return None
+
+    async def __call__(self, scope, receive, send):
+        port = self._match(scope["path"]) if scope["type"] in ("http", "websocket") else None
+        if port is None:
+            return await self.app(scope, receive, send)
+        if scope["type"] == "http":
+            return await self._http(scope, receive, send, port)
+        return await self._websocket(scope, receive, send, port)
+
+    @staticmethod
+    def _target(scope) -> bytes:
+        target = scope.get("raw_path") or scope["path"].encode()
+        if scope.get("query_string"):
+            target += b"?" + scope["query_string"]
+        return target
+
+    async def _http(self, scope, receive, send, port: int):
+        message = await receive()
+        body, more = message.get("body", b""), message.get("more_body", False)
+
+        headers = _forward_headers(scope["headers"])
+        if not any(name == b"content-length" for name, _ in headers):
+            if more:
+                headers.append((b"transfer-encoding", b"chunked"))
+            elif body:
+                headers.append((b"content-length", str(len(body)).encode()))
+        headers.append((b"host", f"localhost:{port}".encode()))
+        if scope.get("client"):
+            headers.append((b"x-forwarded-for", scope["client"][0].encode()))
+        request = h11.Request(method=scope["method"], target=self._target(scope), headers=headers)
+
+        replayable = not more
+        while True:
+            try:
+                conn, reused = await self.pool.acquire(port)
+            except OSError:
+                return await _error(send, 502, b"Vite dev server is not reachable.")
+
+            try:
+                conn.send(request)
+                if body:
+                    conn.send(h11.Data(data=body))
+                while more:
+                    message = await receive()
+                    if message["type"] == "http.disconnect":
+                        conn.close()
+                        return
+                    more = message.get("more_body", False)
+                    if message.get("body"):
+                        conn.send(h11.Data(data=message["body"]))
+                        await conn.writer.drain()
+                conn.send(h11.EndOfMessage())
+                await conn.writer.drain()
+
+                response = await conn.next_event()
+                while isinstance(response, h11.InformationalResponse):
+                    response = await conn.next_event()
+                if not isinstance(response, h11.Response):
+                    raise h11.RemoteProtocolError("Connection closed before response.")
+            except (OSError, h11.ProtocolError):
+                conn.close()
+                if reused and replayable:
+                    continue
+                return await _error(send, 502, b"Vite dev server closed the connection.")
+            break
+
+        try:
+            await send({"type": "http.response.start", "status": response.status_code,
+                        "headers": _forward_headers(list(response.headers))})
+            while True:
+                event = await conn.next_event()
+                if isinstance(event, h11.Data):
+                    await send({"type": "http.response.body", "body": bytes(event.data), "more_body": True})
+                elif isinstance(event, h11.EndOfMessage):
+                    break
+                else:
+                    raise h11.RemoteProtocolError("Connection closed during response.")
+            await send({"type": "http.response.body", "body": b""})
+        except (OSError, h11.ProtocolError):
+            conn.close()
+            return
+        self.pool.release(port, conn)
+
+    async def _websocket(self, scope, receive, send, port: int):
+        await receive()
+        key = base64.b64encode(os.urandom(16)).decode()
+        try:
+            reader, writer = await asyncio.open_connection(self.pool.host, port)
+            lines = [
+                f"GET {self._target(scope).decode('latin-1')} HTTP/1.1",
+                f"Host: localhost:{port}",
+                "Upgrade: websocket",
+                "Connection: Upgrade",
+                f"Sec-WebSocket-Key: {key}",
+                "Sec-WebSocket-Version: 13",
+            ]
+            if scope.get("subprotocols"):
+                lines.append(f"Sec-WebSocket-Protocol: {', '.join(scope['subprotocols'])}")
+            lines += [f"{name.decode('latin-1')}: {value.decode('latin-1')}"
+                      for name, value in _forward_headers(scope["headers"], _ws_headers)]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            status, *head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return await send({"type": "websocket.close", "code": 1011})
+
+        upstream_headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in head)}
+        subprotocol = upstream_headers.get("sec-websocket-protocol")
+        if (status.split(" ")[1:2] != ["101"]
+                or upstream_headers.get("sec-websocket-accept") != _accept_key(key)
+                or upstream_headers.get("sec-websocket-extensions")
+                or (subprotocol is not None and subprotocol not in scope.get("subprotocols", []))):
+            writer.close()
+            return await send({"type": "websocket.close", "code": 1011})
+        await send({"type": "websocket.accept", "subprotocol": subprotocol})
+
+        async def from_upstream():
+            opcode, message = None, bytearray()
+            try:
+                while True:
+                    fin, code, payload = await _read_frame(reader)
+                    if code == 0x8:
+                        close = struct.unpack("!H", payload[:2])[0] if len(payload) >= 2 else 1000
+                        writer.write(_frame(0x8, payload[:2]))
+                        await writer.drain()
+                        return await send({"type": "websocket.close", "code": close,
+                                           "reason": payload[2:].decode("utf-8", "replace")})
+                    if code == 0x9:
+                        writer.write(_frame(0xA, payload))
+                        continue
+                    if code == 0xA:
+                        continue
+                    if (code == 0x0) != (opcode is not None) or code not in (0x0, 0x1, 0x2):
+                        raise WebSocketProtocolError("Unexpected frame in message sequence.")
+                    if code != 0x0:
+                        opcode = code
+                    message += payload
+                    if fin:
+                        if opcode == 0x1:
+                            await send({"type": "websocket.send", "text": message.decode()})
+                        else:
+                            await send({"type": "websocket.send", "bytes": bytes(message)})
+                        opcode, message = None, bytearray()
+            except (WebSocketProtocolError, UnicodeDecodeError):
+                writer.write(_frame(0x8, struct.pack("!H", 1002)))
+                await send({"type": "websocket.close", "code": 1002})
+            except (OSError, asyncio.IncompleteReadError):
+                await send({"type": "websocket.close", "code": 1011})
+
+        async def to_upstream():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    code = message.get("code", 1000)
+                    writer.write(_frame(0x8, struct.pack("!H", 1000 if code in (1005, 1006) else code)))
+                    await writer.drain()
+                    return
+                if message.get("text") is not None:
+                    writer.write(_frame(0x1, message["text"].encode()))
+                else:
+                    writer.write(_frame(0x2, message.get("bytes") or b""))
+                await writer.drain()
+
+        tasks = [asyncio.ensure_future(from_upstream()), asyncio.ensure_future(to_upstream())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
@@ -5,11 +5,11 @@ from dataclasses import dataclass
 from typing import Optional, List, Dict
 from threading import Thread
 from pathlib import Path
-import typer, subprocess, json, re, requests, os
+import typer, subprocess, json, re, requests, os, hashlib, shutil
 
 from flaskpp.fpp_node import home, _node_cmd, _node_env
 from flaskpp.utils import enabled, is_port_free
-from flaskpp.utils.debugger import exception
+from flaskpp.utils.debugger import log, exception
 
 
 @dataclass
@@ -65,6 +65,28 @@ export default defineConfig({{
 }})
 """
 
+vite_bundle_conf = """
+import {{ defineConfig }} from "vite"
+import tailwindcss from "@tailwindcss/vite"
+
+export default defineConfig({{
+  root: "{root}",
+  base: "{base}",
+  publicDir: false,
+  build: {{
+    manifest: true,
+    outDir: "{out_dir}",
+    emptyOutDir: true,
+    rollupOptions: {{
+      input: {inputs},
+    }},
+  }},
+  plugins: [
+    tailwindcss(),
+  ],
+}})
+"""
+
 ts_conf_template = """
 {{
   "compilerOptions": {{
@@ -122,6 +144,9 @@ vite_tw = """
 """
 
 _ports_in_use = []
+_bundle: list["Frontend"] = []
+_prebuilt: dict = {}
+dev_servers: dict[str, int] = {}
 
 
 def prepare_vite():
@@ -174,34 +199,244 @@ def load_manifest(dist: Path) -> Manifest:
     return manifest
 
 
-def resolve_entry(manifest: Manifest, entry: str):
+def _fingerprint(conf: str, *roots: Path) -> str:
+    digest = hashlib.sha256(conf.encode())
+    for file in (home / "package.json", home / "package-lock.json", home / "tsconfig.json"):
+        if file.exists():
+            digest.update(file.read_bytes())
+
+    for root in roots:
+        for current, dirs, names in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in ("dist", "node_modules") and not d.startswith("."))
+            for name in sorted(names):
+                file = Path(current) / name
+                digest.update(str(file.relative_to(root.parent)).encode())
+                digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def _build_hash_file(dist: Path) -> Path:
+    return dist / ".vite" / "fpp-build-hash"
+
+
+def _cached_build(dist: Path, fingerprint: str) -> bool:
+    hash_file = _build_hash_file(dist)
+    return (hash_file.exists() and hash_file.read_text().strip() == fingerprint
+            and (dist / ".vite" / "manifest.json").exists())
+
+
+def _type_check(*roots: Path):
+    if not any(any(root.rglob("*.ts")) for root in roots):
+        return
+
+    result = subprocess.run(
+        [_node_cmd("npx"), "tsc"],
+        cwd=home,
+        env=_node_env(),
+        capture_output=True,
+        text=True
+    )
+    try:
+        if result.returncode != 0: raise ViteError("TypeScript checks failed.")
+    except ViteError as e:
+        exception(e, result.stderr or result.stdout)
+
+
+def _relative(path: Path, base: Path) -> str:
+    return Path(os.path.relpath(path, base)).as_posix()
+
+
+def _prepare_root(root: Path):
+    root.mkdir(exist_ok=True)
+    (root / "public").mkdir(exist_ok=True)
+    src = root / "src"
+    src.mkdir(exist_ok=True)
+    main = root / "main.js"
+    if not main.exists():
+        main.write_text(vite_main)
+    main_css = src / "main.css"
+    if not main_css.exists():
+        main_css.write_text(vite_tw)
+
+
+def _write_conf(root: Path) -> tuple[str, str]:
+    conf_name = f"vite.config.{re.sub(r'[^a-zA-Z0-9_-]', '_', _relative(root, Path.cwd()))}.js"
+    conf = vite_conf.format(
+        root=str(root),
+        entry_point=str(root / "main.js")
+    )
+    (home / conf_name).write_text(conf)
+    return conf_name, conf
+
+
+def _write_bundle_conf(base: Path, prefix: str, dist: Path, roots: list[Path]) -> tuple[str, str]:
+    inputs = {re.sub(r"[^a-zA-Z0-9_-]", "_", _relative(root, base)): str(root / "main.js") for root in roots}
+    conf = vite_bundle_conf.format(
+        root=str(base),
+        base=f"{prefix}/",
+        out_dir=str(dist),
+        inputs=json.dumps(inputs, indent=8)
+    )
+    (home / "vite.config.bundle.js").write_text(conf)
+    return "vite.config.bundle.js", conf
+
+
+def _run_build(conf_name: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [_node_cmd("npm"), "run", "build", "--", "--config", conf_name],
+        cwd=home,
+        env=_node_env()
+    )
+
+
+def split_manifest(manifest: Manifest, prefix: str) -> Manifest:
+    view = dict(manifest)
+    view.update({key[len(prefix):]: chunk for key, chunk in manifest.items() if key.startswith(prefix)})
+    return view
+
+
+def _load_bundle(build: subprocess.Popen, frontends: list["Frontend"], base: Path, dist: Path, fingerprint: str):
+    build.wait()
+    if build.returncode != 0:
+        raise ViteError("Vite bundle build process failed.")
+    manifest = load_manifest(dist)
+    for frontend in frontends:
+        frontend.manifest = split_manifest(manifest, f"{_relative(frontend.root, base)}/")
+    _build_hash_file(dist).write_text(fingerprint)
+
+
+def build_bundle(app_frontend: "Frontend"):
+    frontends = [frontend for frontend in _bundle if frontend is not app_frontend] + [app_frontend]
+    _bundle.clear()
+    if not app_frontend.bundled:
+        return
+
+    if enabled("PREBUILT_FRONTEND"):
+        for frontend in frontends:
+            frontend.prefix = app_frontend.prefix
+        return
+
+    base = app_frontend.root.parent
+    dist = app_frontend.root / "dist"
+    roots = [frontend.root for frontend in frontends]
+    conf_name, conf = _write_bundle_conf(base, app_frontend.prefix, dist, roots)
+    fingerprint = _fingerprint(conf, *roots)
+    for frontend in frontends:
+        frontend.prefix, frontend.dist, frontend.fingerprint = app_frontend.prefix, dist, fingerprint
+
+    if _cached_build(dist, fingerprint):
+        manifest = load_manifest(dist)
+        for frontend in frontends:
+            frontend.manifest = split_manifest(manifest, f"{_relative(frontend.root, base)}/")
+        log("info", f"Vite bundle of {len(frontends)} frontends is up to date.")
+        return
+
+    _type_check(*roots)
+    build = _run_build(conf_name)
+    loader = Thread(target=_load_bundle, args=(build, frontends, base, dist, fingerprint))
+    for frontend in frontends:
+        frontend.build, frontend.loader = build, loader
+    loader.start()
+
+
+def build_frontends(roots: list[Path], build_dir: Path, bundle_prefix: str = None) -> dict[str, dict]:
+    base = Path.cwd()
+    for root in roots:
+        _prepare_root(root)
+
+    app_root = base / "vite"
+    if bundle_prefix is not None and app_root in roots:
+        jobs = [(*_write_bundle_conf(base, bundle_prefix, app_root / "dist", roots), roots, app_root / "dist")]
+    else:
+        jobs = [(*_write_conf(root), [root], root / "dist") for root in roots]
+
+    pending = []
+    for conf_name, conf, job_roots, dist in jobs:
+        fingerprint = _fingerprint(conf, *job_roots)
+        if not _cached_build(dist, fingerprint):
+            pending.append((conf_name, dist, fingerprint))
+
+    if pending:
+        _type_check(*roots)
+        builds = [(_run_build(conf_name), dist, fingerprint) for conf_name, dist, fingerprint in pending]
+        failed = []
+        for build, dist, fingerprint in builds:
+            build.wait()
+            if build.returncode != 0:
+                failed.append(_relative(dist, base))
+                continue
+            _build_hash_file(dist).write_text(fingerprint)
+        if failed:
+            raise ViteError(f"Vite build failed for {', '.join(failed)}.")
+
+    entries = {}
+    for _, _, job_roots, dist in jobs:
+        target = build_dir / "frontends" / _relative(dist.parent, base)
+        shutil.copytree(dist, target, dirs_exist_ok=True)
+        for root in job_roots:
+            entries[_relative(root, base)] = {
+                "dist": _relative(target, build_dir),
+                "prefix": f"{_relative(root, base)}/" if len(job_roots) > 1 else "",
+            }
+    return entries
+
+
+def prebuilt_index() -> dict:
+    if "index" not in _prebuilt:
+        builds = Path.cwd() / "builds"
+        latest = builds / "LATEST"
+        build_id = os.getenv("FRONTEND_BUILD") or (latest.read_text().strip() if latest.exists() else None)
+        if not build_id:
+            raise ViteError("No frontend build found. Run 'fpp build' first.")
+
+        index_file = builds / build_id / "index.json"
+        if not index_file.exists():
+            raise ViteError(f"Frontend build '{build_id}' not found.")
+        index = json.loads(index_file.read_text())
+        index["path"] = str(index_file.parent)
+        _prebuilt["index"] = index
+    return _prebuilt["index"]
+
+
+def load_prebuilt(root: Path) -> tuple[Path, Manifest]:
+    index = prebuilt_index()
+    entry = index["frontends"].get(_relative(root, Path.cwd()))
+    if entry is None:
+        raise ViteError(f"'{_relative(root, Path.cwd())}' is missing in frontend build '{index['id']}'.")
+
+    dist = Path(index["path"]) / entry["dist"]
+    manifest = load_manifest(dist)
+    return dist, split_manifest(manifest, entry["prefix"]) if entry["prefix"] else manifest
+
+
+def resolve_entry(manifest: Manifest, entry: str, dynamic: bool = False) -> tuple[list[str], list[str]]:
     if entry not in manifest:
         raise ViteError(f"'{entry}' not found in Vite manifest.")
 
-    js_files = set()
-    css_files = set()
-
+    js_files, css_files = [], []
     visited = set()
-    def collect(chunk_name: str):
-        if chunk_name in visited:
-            return
 
+    def collect(chunk_name: str):
         chunk = manifest.get(chunk_name)
-        if not chunk:
+        if chunk_name in visited or not chunk:
             return
         visited.add(chunk_name)
 
-        js_files.add(chunk.file)
-
-        if chunk.css:
-            css_files.update(chunk.css)
-
-        if chunk.imports:
-            for dep in chunk.imports:
+        target = css_files if chunk.file.endswith(".css") else js_files
+        if chunk.file not in target:
+            target.append(chunk.file)
+        for file in chunk.css or []:
+            if file not in css_files:
+                css_files.append(file)
+
+        for dep in chunk.imports or []:
+            collect(dep)
+        if dynamic:
+            for dep in chunk.dynamicImports or []:
                 collect(dep)
 
     collect(entry)
-    return list(js_files), list(css_files)
+    return js_files, css_files
 
 
 class Frontend(Blueprint):
@@ -215,24 +450,10 @@ class Frontend(Blueprint):
 
 
         root = (Path(parent.root_path) / "vite").resolve()
-        root.mkdir(exist_ok=True)
-        public = root / "public"
-        public.mkdir(exist_ok=True)
-        src = root / "src"
-        src.mkdir(exist_ok=True)
-        main = root / "main.js"
-        main_css = src / "main.css"
-        safe_name = re.sub(r"[^a-zA-Z0-9_-]", "_", parent.name)
-        conf_name = f"vite.config.{safe_name}.js"
-        (home / conf_name).write_text(vite_conf.format(
-            root=str(root),
-            entry_point=str(main)
-        ))
-        conf_params = ["--config", conf_name]
-        if not main.exists():
-            main.write_text(vite_main)
-        if not main_css.exists():
-            main_css.write_text(vite_tw)
+        self.root = root
+        self.bundled = enabled("VITE_BUNDLE") and not enabled("DEBUG_MODE")
+        _prepare_root(root)
+        conf_name, conf = _write_conf(root)
 
         if enabled("DEBUG_MODE"):
             self.session = requests.Session()
@@ -241,35 +462,37 @@ class Frontend(Blueprint):
             while not is_port_free(self.port):
                 self.port += 100
             _ports_in_use.append(self.port)
+            dev_servers[self.prefix] = self.port
 
             self.server = subprocess.Popen(
-                [_node_cmd("npm"), "run", "dev", "--", "--port", str(self.port), *conf_params],
+                [_node_cmd("npm"), "run", "dev", "--", "--port", str(self.port), "--base", f"{self.prefix}/",
+                 "--config", conf_name],
                 cwd=home,
                 env=_node_env()
             )
         else:
-            if any(root.rglob("*.ts")):
-                result = subprocess.run(
-                    [_node_cmd("npx"), "tsc"],
-                    cwd=home,
-                    env=_node_env(),
-                    capture_output=True,
-                    text=True
-                )
-                try:
-                    if result.returncode != 0: raise ViteError("TypeScript checks failed.")
-                except ViteError as e:
-                    exception(e, result.stderr or result.stdout)
-
-            self.build = subprocess.Popen(
-                [_node_cmd("npm"), "run", "build", "--", *conf_params],
-                cwd=home,
-                env=_node_env()
-            )
             self.dist = root / "dist"
             self.manifest = None
-            self.loader = Thread(target=self._load_manifest)
-            self.loader.start()
+            self.build = None
+            self.loader = None
+            self.fingerprint = None
+
+            if enabled("PREBUILT_FRONTEND"):
+                self.dist, self.manifest = load_prebuilt(root)
+                if self.bundled:
+                    _bundle.append(self)
+            elif self.bundled:
+                _bundle.append(self)
+            else:
+                self.fingerprint = _fingerprint(conf, root)
+                if _cached_build(self.dist, self.fingerprint):
+                    self.manifest = load_manifest(self.dist)
+                    log("info", f"Vite build of '{parent.name}' is up to date.")
+                else:
+                    _type_check(root)
+                    self.build = _run_build(conf_name)
+                    self.loader = Thread(target=self._load_manifest)
+                    self.loader.start()
 
         parent.register_blueprint(self)
 
@@ -278,8 +501,9 @@ class Frontend(Blueprint):
         if self.build.returncode != 0:
             raise ViteError("Vite build process failed.")
         self.manifest = load_manifest(self.dist)
+        _build_hash_file(self.dist).write_text(self.fingerprint)
 
-    def vite(self, entry: str):
+    def vite(self, entry: str, preload_dynamic: bool = False):
         if enabled("DEBUG_MODE"):
             if entry.endswith(".js"):
                 return Markup(f'<script type="module" src="{self.prefix}/{entry}"></script>')
@@ -287,39 +511,56 @@ class Frontend(Blueprint):
                 return Markup(f'<link rel="stylesheet" href="{self.prefix}/{entry}">')
             return ""
 
-        js, css = resolve_entry(self.manifest, entry)
+        key = (entry, preload_dynamic)
+        tags = self._tags.get(key)
+        if tags is not None:
+            return tags
 
-        tags = []
+        if self._manifest is None and self.loader:
+            self.loader.join()
+        js, css = resolve_entry(self._manifest, entry, preload_dynamic)
 
-        for file in css:
-            tags.append(f'<link rel="stylesheet" href="{self.prefix}/{file}">')
+        lines = [f'<link rel="stylesheet" href="{self.prefix}/{file}">' for file in css]
+        if js:
+            lines.append(f'<script type="module" src="{self.prefix}/{js[0]}"></script>')
+            lines += [f'<link rel="modulepreload" href="{self.prefix}/{file}">' for file in js[1:]]
 
-        for file in js:
-            tags.append(f'<script type="module" src="{self.prefix}/{file}"></script>')
+        tags = self._tags[key] = Markup("\n".join(lines))
+        return tags
+
+    @property
+    def manifest(self) -> Manifest | None:
+        return self._manifest
 
-        return Markup("\n".join(tags))
+    @manifest.setter
+    def manifest(self, manifest: Manifest | None):
+        self._manifest = manifest
+        self._tags = {}
 
     def serve(self, path) -> Response:
         if not enabled("DEBUG_MODE"):
             if self.built and not self.dist.exists():
                 raise ViteError("Missing vite/dist directory.")
-            elif self.loader.is_alive():
+            elif self.loader and self.loader.is_alive():
                 self.loader.join()
             elif not self.built:
                 raise ViteError("There was an error while building vite.")
 
+            public = self.root / "public"
+            if self.bundled and (public / path).is_file():
+                return send_from_directory(public, path)
             return send_from_directory(self.dist.resolve(), path)
 
         if not self.server or self.server.poll() is not None:
             raise ViteError("Frontend server is not running.")
-        upstream = self.session.get(f"http://localhost:{self.port}/{path}")
+        upstream = self.session.get(f"http://localhost:{self.port}{self.prefix}/{path}")
         response = Response(upstream.content, upstream.status_code)
         response.headers = Headers(upstream.headers)
         return response
 
     @property
     def built(self) -> bool:
-        return not enabled("DEBUG_MODE") and self.build.returncode == 0
+        return not enabled("DEBUG_MODE") and (self.build is None or self.build.returncode == 0)
 
 
 class ViteError(Exception):
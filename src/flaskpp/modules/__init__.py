@@ -87,38 +87,43 @@ def register_modules(app):
 
     loader_context = {}
     primary_loader = None
+    startup = getattr(app, "startup", None)
     for mod_name, setting in config["modules"].items():
         enabled = setting.strip().lower() in ["true", "1", "yes"]
         if not enabled:
             continue
 
         try:
-            mod = import_module(f"modules.{mod_name}")
-        except ModuleNotFoundError as e:
-            exception(e, f"Could not import module '{mod_name}' for app '{app_name}'.")
-            continue
+            try:
+                mod = import_module(f"modules.{mod_name}")
+            except ModuleNotFoundError as e:
+                exception(e, f"Could not import module '{mod_name}' for app '{app_name}'.")
+                continue
 
-        from flaskpp import Module
-        module = getattr(mod, "module", None)
-        if not isinstance(module, Module):
-            log("error", f"Missing 'module: Module' in module '{mod_name}'.")
-            continue
+            from flaskpp import Module
+            module = getattr(mod, "module", None)
+            if not isinstance(module, Module):
+                log("error", f"Missing 'module: Module' in module '{mod_name}'.")
+                continue
 
-        try:
-            log("info", f"Registering: {module}")
-        except ManifestError as e:
-            exception(e, f"Failed to log {mod_name}.module")
-            continue
+            try:
+                log("info", f"Registering: {module}")
+            except ManifestError as e:
+                exception(e, f"Failed to log {mod_name}.module")
+                continue
 
-        try:
-            home = os.getenv("HOME_MODULE", "").lower() == mod_name.lower()
-            module.enable(app, home)
-            loader_context[mod_name] = FileSystemLoader(f"modules/{mod_name}/templates")
-            if home:
-                primary_loader = loader_context[mod_name]
-            log("info", f"Registered module '{mod_name}' as {'home' if home else 'path'}.")
-        except Exception as e:
-            exception(e, f"Failed registering module '{mod_name}'.")
+            try:
+                home = os.getenv("HOME_MODULE", "").lower() == mod_name.lower()
+                module.enable(app, home)
+                loader_context[mod_name] = FileSystemLoader(f"modules/{mod_name}/templates")
+                if home:
+                    primary_loader = loader_context[mod_name]
+                log("info", f"Registered module '{mod_name}' as {'home' if home else 'path'}.")
+            except Exception as e:
+                exception(e, f"Failed registering module '{mod_name}'.")
+        finally:
+            if startup:
+                startup.mark(f"module {mod_name}")
 
     loaders = []
     if primary_loader:
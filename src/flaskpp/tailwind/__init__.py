@@ -1,7 +1,8 @@
 from flask import Flask
 from pathlib import Path
 from tqdm import tqdm
-import os, platform, typer, requests, subprocess
+from concurrent.futures import ThreadPoolExecutor
+import os, platform, typer, requests, subprocess, hashlib, json, re
 
 home = Path(__file__).parent.resolve()
 tailwind_cli = {
@@ -27,34 +28,115 @@ def _tailwind_cmd():
     return str(home / "tailwind")
 
 
+_source_suffixes = {".html", ".jinja", ".jinja2", ".j2", ".js", ".mjs", ".ts", ".jsx", ".tsx", ".vue", ".svelte",
+                    ".py", ".md", ".css"}
+_pruned_dirs = {"node_modules", "venv", ".venv", "__pycache__", "builds"}
+_source_rule = re.compile(r'@source\s+(not\s+)?["\']([^"\']+)["\']')
+
+
+def _targets(root: Path) -> list[Path]:
+    dirs = [root / "static" / "css"]
+    modules = root / "modules"
+    if modules.is_dir():
+        dirs += sorted(m / "static" / "css" for m in modules.iterdir() if m.is_dir())
+    return [d for d in dirs if (d / "tailwind_raw.css").is_file()]
+
+
+def _sources(in_file: Path) -> list[Path]:
+    css_dir = in_file.parent
+    base = css_dir.parent.parent
+    roots, excluded = [base], set()
+    for negated, source in _source_rule.findall(in_file.read_text(encoding="utf-8")):
+        path = (css_dir / source).resolve()
+        if negated:
+            excluded.add(path)
+        elif path.is_dir():
+            roots.append(path)
+
+    files = []
+    for source_root in roots:
+        for current, dirs, names in os.walk(source_root):
+            current = Path(current)
+            dirs[:] = sorted(
+                d for d in dirs
+                if not d.startswith(".") and d not in _pruned_dirs and (current / d).resolve() not in excluded
+            )
+            files += [current / name for name in sorted(names) if Path(name).suffix in _source_suffixes]
+
+    out = css_dir / "tailwind.css"
+    return [f for f in files if f != out]
+
+
+def _fingerprint(in_file: Path) -> str:
+    digest = hashlib.sha256(in_file.read_bytes())
+    for file in _sources(in_file):
+        digest.update(str(file).encode())
+        digest.update(file.read_bytes())
+    return digest.hexdigest()
+
+
+def _build(in_file: Path, out: Path, cwd: Path = None):
+    result = subprocess.run(
+        [_tailwind_cmd(),
+         "-i", str(in_file),
+         "-o", str(out), "--minify"],
+        cwd=cwd or in_file.parent,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise TailwindError(f"Failed to generate {out}: {result.stderr.strip()}")
+
+
 def generate_tailwind_css(app: Flask):
     out =  (home.parent / "app" / "static" / "css" / "tailwind.css")
 
     if not out.exists():
-        result = subprocess.run(
-            [_tailwind_cmd(),
-             "-i", str(out.parent / "tailwind_raw.css"),
-             "-o", str(out), "--minify"],
-            cwd=home.parent
-        )
-        if result.returncode != 0:
-            raise TailwindError(f"Failed to generate {out}")
+        _build(out.parent / "tailwind_raw.css", out, home.parent)
 
     root = Path(app.root_path).resolve()
-
-    for d in root.rglob("static/css"):
-        in_file = d / "tailwind_raw.css"
-        if not in_file.exists():
+    cache_file = Path(app.instance_path) / "tailwind_cache.json"
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        cache = {}
+
+    pending = {}
+    for d in _targets(root):
+        in_file, target = d / "tailwind_raw.css", d / "tailwind.css"
+        fingerprint = _fingerprint(in_file)
+        key = str(d.relative_to(root))
+        if target.exists() and cache.get(key) == fingerprint:
             continue
+        pending[key] = (in_file, target, fingerprint)
+
+    if not pending:
+        return
 
-        result = subprocess.run(
-            [_tailwind_cmd(),
-             "-i", str(in_file),
-             "-o", str(d / "tailwind.css"), "--minify"],
-            cwd=d
-        )
-        if result.returncode != 0:
-            raise TailwindError(f"Failed to generate {d / 'tailwind.css'}")
+    errors = []
+    with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as pool:
+        futures = {key: pool.submit(_build, in_file, target) for key, (in_file, target, _) in pending.items()}
+        for key, future in futures.items():
+            try:
+                future.result()
+                cache[key] = pending[key][2]
+            except TailwindError as e:
+                cache.pop(key, None)
+                errors.append(str(e))
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps(cache, indent=2))
+    if errors:
+        raise TailwindError("\n".join(errors))
+
+
+def verify_tailwind_css(app: Flask):
+    root = Path(app.root_path).resolve()
+    outputs = [home.parent / "app" / "static" / "css" / "tailwind.css"]
+    outputs += [d / "tailwind.css" for d in _targets(root)]
+    missing = [str(out) for out in outputs if not out.exists()]
+    if missing:
+        raise TailwindError(f"Missing prebuilt {', '.join(missing)}. Run 'fpp build' first.")
 
 
 def setup_tailwind():
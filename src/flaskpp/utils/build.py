@@ -0,0 +1,63 @@
+from flask import Flask
+from pathlib import Path
+from configparser import ConfigParser
+from datetime import datetime
+import typer, os, json, hashlib
+
+from flaskpp.utils import enabled
+from flaskpp.utils.run import conf_path, _env_from_conf
+
+builds_path = Path.cwd() / "builds"
+
+
+def _enabled_modules(conf: Path) -> list[str]:
+    config = ConfigParser()
+    config.optionxform = str
+    config.read(conf)
+    if "modules" not in config:
+        return []
+    return [name for name, setting in config["modules"].items() if setting.strip().lower() in ["true", "1", "yes"]]
+
+
+def build(app: str = typer.Option(..., "-a", "--app", help="The app whose frontends should be built.")):
+    conf = conf_path / f"{app}.conf"
+    if not conf.exists():
+        typer.echo(typer.style(f"Missing app config '{conf.name}'.", fg=typer.colors.RED, bold=True))
+        raise typer.Exit(1)
+    os.environ.update(_env_from_conf(conf))
+    os.environ["APP_NAME"] = app
+
+    from flaskpp.tailwind import generate_tailwind_css, _targets
+    from flaskpp.fpp_node.vite import build_frontends
+
+    root = Path.cwd()
+    typer.echo(typer.style("Building tailwind css...", bold=True))
+    generate_tailwind_css(Flask("main", root_path=str(root), instance_path=str(root / "instance")))
+    tailwind = {
+        str(d.relative_to(root)): hashlib.sha256((d / "tailwind.css").read_bytes()).hexdigest()
+        for d in _targets(root)
+    }
+
+    roots = []
+    if enabled("FRONTEND_ENGINE"):
+        roots.append(root / "vite")
+        roots += [root / "modules" / name / "vite" for name in _enabled_modules(conf) if (root / "modules" / name).is_dir()]
+
+    build_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    build_dir = builds_path / build_id
+    build_dir.mkdir(parents=True, exist_ok=True)
+    typer.echo(typer.style(f"Building {len(roots)} frontends...", bold=True))
+    prefix = "/app/vite" if os.getenv("HOME_MODULE") else "/vite"
+    frontends = build_frontends(roots, build_dir, prefix if enabled("VITE_BUNDLE") else None)
+
+    (build_dir / "index.json").write_text(json.dumps({
+        "id": build_id,
+        "app": app,
+        "created": datetime.now().astimezone().isoformat(),
+        "bundle": enabled("VITE_BUNDLE"),
+        "frontends": frontends,
+        "tailwind": tailwind,
+    }, indent=2))
+    (builds_path / "LATEST").write_text(build_id)
+
+    typer.echo(typer.style(f"Build {build_id} written to {build_dir}.", fg=typer.colors.GREEN, bold=True))
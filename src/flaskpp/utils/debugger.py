@@ -1,23 +1,92 @@
 from datetime import datetime
-import traceback, sys
+from queue import Queue, Empty
+from threading import Thread, Lock
+import traceback, sys, time, random, atexit
 
 _debug = False
 
+_records = Queue()
+_sampling: dict[str, float] = {}
+_writer = {"thread": None}
+_writer_lock = Lock()
+_time_cache = [-1, ""]
+_batch_size = 256
 
-def get_time() -> str:
-    offset = datetime.now().astimezone().utcoffset()
-    hours = int(offset.total_seconds() // 3600)
-    minutes = int((offset.total_seconds() % 3600) // 60)
 
-    sign = '+' if offset.total_seconds() >= 0 else '-'
-    offset_str = f"{sign}{abs(hours):02d}{abs(minutes):02d}"
+def get_time(ts: float = None) -> str:
+    second = int(ts if ts is not None else time.time())
+    if _time_cache[0] == second:
+        return _time_cache[1]
 
-    return f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {offset_str}"
+    now = datetime.fromtimestamp(second).astimezone()
+    offset = now.utcoffset().total_seconds()
+    hours = int(abs(offset) // 3600)
+    minutes = int((abs(offset) % 3600) // 60)
+
+    sign = '+' if offset >= 0 else '-'
+    prefix = f"{now.strftime('%Y-%m-%d %H:%M:%S')} {sign}{hours:02d}{minutes:02d}"
+    _time_cache[0], _time_cache[1] = second, prefix
+    return prefix
+
+
+def set_sampling(category: str, rate: float):
+    _sampling[category.lower()] = rate
+
+
+def _format(record: tuple) -> str:
+    category, message, ts = record
+    return f"[FLASK]\t[{get_time(ts)}] [{category.upper()}] {message}\n"
+
+
+def _write(lines: list[str]):
+    try:
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
+    except (OSError, ValueError):
+        pass
+
+
+def _run_writer():
+    while True:
+        lines = [_format(_records.get())]
+        while len(lines) < _batch_size:
+            try:
+                lines.append(_format(_records.get_nowait()))
+            except Empty:
+                break
+        _write(lines)
+        for _ in lines:
+            _records.task_done()
+
+
+def _ensure_writer():
+    with _writer_lock:
+        if _writer["thread"] is None:
+            thread = Thread(target=_run_writer, daemon=True, name="fpp-log-writer")
+            _writer["thread"] = thread
+            thread.start()
+
+
+def flush(timeout: float = 2.0):
+    if _writer["thread"] is None:
+        return
+    deadline = time.monotonic() + timeout
+    with _records.all_tasks_done:
+        while _records.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            _records.all_tasks_done.wait(remaining)
 
 
 def log(category: str, message: str):
-    log_str = f"[FLASK]\t[{get_time()}] [{category.upper()}] {message}"
-    print(log_str)
+    rate = _sampling.get(category)
+    if rate is not None and (rate <= 0 or (rate < 1 and random.random() >= rate)):
+        return
+
+    if _writer["thread"] is None:
+        _ensure_writer()
+    _records.put((category, message, time.time()))
 
 
 def exception(error: Exception, message: str = None):
@@ -34,8 +103,13 @@ def debug_msg(message: str):
         log("debug", message)
 
 
-def start_session(debug: bool):
+def start_session(debug: bool, sampling: dict[str, float] = None):
     global _debug
     _debug = debug
+    for category, rate in (sampling or {}).items():
+        set_sampling(category, rate)
     log("info", "Flask plug & play module server running.")
     log("info", f"Loglevel {'debug' if debug else 'info'}.")
+
+
+atexit.register(flush)
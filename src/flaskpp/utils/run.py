@@ -72,6 +72,11 @@ def start_app(conf_file: Path, default_port: int, reload: bool = False) -> int:
     base_env["SERVER_PORT"] = str(port)
     log_file = _ensure_log_file(app_name)
 
+    metrics_dir = base_env.get("METRICS_DIR")
+    if metrics_dir and base_env.get("EXT_METRICS", "0").lower() in ["true", "1", "yes"]:
+        from flaskpp.app.metrics import clear_metrics_dir
+        clear_metrics_dir(root_path / metrics_dir)
+
     proc = subprocess.Popen(
         [
             sys.executable, "-m", "uvicorn",
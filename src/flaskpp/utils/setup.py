@@ -62,11 +62,16 @@ def base_config():
             "EXT_CACHE": 0,
             "EXT_API": 0,
             "EXT_JWT_EXTENDED": 0,
+            "EXT_METRICS": 0,
         },
 
         "features": {
             "default_FPP_PROCESSING": 1,
             "default_FRONTEND_ENGINE": 1,
+            "BABEL_SYNC": 0,
+            "BABEL_PRECOMPILE": 0,
+            "VITE_BUNDLE": 0,
+            "PREBUILT_FRONTEND": 0,
         },
 
         "dev": {
@@ -0,0 +1,56 @@
+import os, sys, time
+
+_last = {"timeline": None}
+
+
+def rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class StartupTimeline:
+    def __init__(self, started: float = None, baseline: int = None):
+        self.started = started or time.perf_counter()
+        self.phases: list[dict] = []
+        self._last = self.started
+        self._rss = rss() if baseline is None else baseline
+        _last["timeline"] = self
+
+    def mark(self, phase: str):
+        now, memory = time.perf_counter(), rss()
+        self.phases.append({
+            "phase": phase,
+            "seconds": now - self._last,
+            "rss": memory,
+            "rss_delta": memory - self._rss,
+        })
+        self._last, self._rss = now, memory
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def as_dict(self) -> dict:
+        return {"total": self.total, "rss": self._rss, "phases": self.phases}
+
+    def summary(self) -> list[str]:
+        lines = [f"{'phase':40} {'ms':>9} {'rss delta':>11}"]
+        for entry in self.phases:
+            lines.append(
+                f"{entry['phase'][:40]:40} {entry['seconds'] * 1000:9.1f} {entry['rss_delta'] / 1048576:+9.1f}MB"
+            )
+        lines.append(f"{'total':40} {self.total * 1000:9.1f} {self._rss / 1048576:9.1f}MB")
+        return lines
+
+
+def last_timeline() -> StartupTimeline | None:
+    return _last["timeline"]
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+import flaskpp
 from flaskpp import FlaskPP
 from flaskpp.app.config.default import DefaultConfig
 
@@ -63,3 +64,47 @@ def test_flaskpp_asgi(mock_i18n, mock_register, mock_generate):
 
     asgi = app.to_asgi()
     assert hasattr(asgi, "__call__")
+
+
+@patch("flaskpp.generate_tailwind_css")
+@patch("flaskpp.register_modules")
+@patch("flaskpp.init_i18n")
+def test_flaskpp_startup_timeline(mock_i18n, mock_register, mock_generate):
+    from flaskpp.utils.timeline import last_timeline
+
+    mock_register.side_effect = lambda app: app.startup.mark("module example")
+    with patch("flaskpp.enabled", return_value=False):
+        app = FlaskPP(__name__, "DEFAULT")
+
+    phases = [entry["phase"] for entry in app.startup.phases]
+    assert phases[:2] == ["imports", "config"]
+    assert phases.index("tailwind") < phases.index("module example") < phases.index("i18n")
+    assert phases[-1] == "finish"
+    assert last_timeline() is app.startup
+    assert abs(sum(entry["seconds"] for entry in app.startup.phases) - app.startup.total) < 1e-6
+    assert len(app.startup.summary()) == len(phases) + 2
+
+    with patch.dict(flaskpp._import_baseline, {"started": app.startup.started - 5, "rss": 0}), \
+            patch("flaskpp.enabled", return_value=False):
+        first = FlaskPP(__name__, "DEFAULT")
+        assert not flaskpp._import_baseline
+        second = FlaskPP(__name__, "DEFAULT")
+    imports = first.startup.phases[0]
+    assert imports["seconds"] >= 5 and imports["rss_delta"] == imports["rss"]
+    assert second.startup.started >= first.startup.started + first.startup.total
+    assert second.startup.phases[0]["seconds"] < 1
+
+
+def test_startup_report_shows_failed_boot(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+    from flaskpp.cli import app as cli
+
+    (tmp_path / "example.conf").write_text("[core]\nSECRET_KEY = x\n")
+    (tmp_path / "main.py").write_text('raise RuntimeError("broken factory")\n')
+    monkeypatch.chdir(tmp_path)
+    with patch("flaskpp.app.cli.conf_path", tmp_path):
+        result = CliRunner().invoke(cli, ["startup-report", "-a", "example"])
+
+    assert result.exit_code == 1
+    assert "RuntimeError: broken factory" in result.output
+    assert "Failed to boot 'example' (exit status 1)." in result.output
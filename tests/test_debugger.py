@@ -0,0 +1,39 @@
+from flaskpp.utils import debugger
+
+
+def test_log_is_batched_and_sampled(capsys):
+    debugger.set_sampling("test_muted", 0)
+    for i in range(3):
+        debugger.log("test", f"message {i}")
+        debugger.log("test_muted", "never")
+    debugger.flush()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split("] ", 2)[-1] for line in lines] == [f"message {i}" for i in range(3)]
+    assert all(line.startswith(f"[FLASK]\t[{debugger.get_time()[:10]}") for line in lines)
+    assert debugger.get_time(0) is debugger.get_time(0.5)
+
+
+def test_json_access_log(capsys):
+    from flask import Flask, Blueprint
+    import json
+    from flaskpp import set_default_handlers
+
+    app = Flask(__name__)
+    app.config.update(ACCESS_LOG="json", ACCESS_LOG_SAMPLING={"quiet": 0})
+    set_default_handlers(app)
+    app.route("/ping")(lambda: "pong")
+    quiet = Blueprint("quiet", __name__)
+    quiet.route("/quiet")(lambda: "shh")
+    app.register_blueprint(quiet)
+
+    client = app.test_client()
+    client.get("/ping")
+    client.get("/quiet")
+    debugger.flush()
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if "[ACCESS]" in line]
+    assert len(lines) == 1
+    record = json.loads(lines[0].split("[ACCESS] ", 1)[1])
+    assert record["path"] == "/ping" and record["status"] == 200 and record["bytes"] == 4
+    assert record["endpoint"] == "<lambda>" and record["duration_ms"] >= 0
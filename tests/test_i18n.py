@@ -1,11 +1,15 @@
 from flask import Flask
 from babel.support import Translations
 from unittest.mock import patch, MagicMock
+import pytest
 
+from flaskpp.app.extensions import db
+from flaskpp.app.data import babel as i18n_data
 from flaskpp.app.i18n import (
     DBMergedTranslations,
     DBDomain,
-    init_i18n
+    init_i18n,
+    clear_translations
 )
 
 
@@ -17,11 +21,8 @@ class DummyTranslations(Translations):
         return f"mo:{singular if n == 1 else plural}"
 
 
-@patch("flaskpp.app.i18n.I18nMessage")
-def test_dbmerged_gettext_db_hit(mock_model):
-    row = MagicMock()
-    row.text = "db-value"
-    mock_model.query.filter_by.return_value.first.return_value = row
+@patch("flaskpp.app.i18n.get_catalog", return_value={"hello": "db-value"})
+def test_dbmerged_gettext_db_hit(mock_catalog):
 
     wrapped = DummyTranslations()
     dbt = DBMergedTranslations(wrapped, "messages", "en")
@@ -29,9 +30,8 @@ def test_dbmerged_gettext_db_hit(mock_model):
     assert dbt.gettext("hello") == "db-value"
 
 
-@patch("flaskpp.app.i18n.I18nMessage")
-def test_dbmerged_gettext_no_db_fallback(mock_model):
-    mock_model.query.filter_by.return_value.first.return_value = None
+@patch("flaskpp.app.i18n.get_catalog", return_value={})
+def test_dbmerged_gettext_no_db_fallback(mock_catalog):
 
     wrapped = DummyTranslations()
     dbt = DBMergedTranslations(wrapped, "messages", "en")
@@ -39,11 +39,8 @@ def test_dbmerged_gettext_no_db_fallback(mock_model):
     assert dbt.gettext("hello") == "mo:hello"
 
 
-@patch("flaskpp.app.i18n.I18nMessage")
-def test_dbmerged_ngettext_db_hit(mock_model):
-    row = MagicMock()
-    row.text = "db-plural"
-    mock_model.query.filter_by.return_value.first.return_value = row
+@patch("flaskpp.app.i18n.get_catalog", return_value={"many": "db-plural"})
+def test_dbmerged_ngettext_db_hit(mock_catalog):
 
     wrapped = DummyTranslations()
     dbt = DBMergedTranslations(wrapped, "messages", "en")
@@ -51,9 +48,8 @@ def test_dbmerged_ngettext_db_hit(mock_model):
     assert dbt.ngettext("one", "many", 2) == "db-plural"
 
 
-@patch("flaskpp.app.i18n.I18nMessage")
-def test_dbmerged_ngettext_fallback(mock_model):
-    mock_model.query.filter_by.return_value.first.return_value = None
+@patch("flaskpp.app.i18n.get_catalog", return_value={})
+def test_dbmerged_ngettext_fallback(mock_catalog):
 
     wrapped = DummyTranslations()
     dbt = DBMergedTranslations(wrapped, "messages", "en")
@@ -66,6 +62,7 @@ def test_dbmerged_ngettext_fallback(mock_model):
 def test_dbdomain_returns_dbmerged(mock_load, mock_locale):
     mock_load.return_value = DummyTranslations()
 
+    clear_translations()
     domain = DBDomain(domain="messages")
 
     app = Flask(__name__)
@@ -75,9 +72,331 @@ def test_dbdomain_returns_dbmerged(mock_load, mock_locale):
     assert isinstance(translations, DBMergedTranslations)
 
 
+@patch("flaskpp.app.i18n.get_locale", return_value="en")
+@patch("flaskpp.app.i18n.Translations.load")
+def test_dbdomain_loads_catalog_once(mock_load, mock_locale):
+    mock_load.return_value = DummyTranslations()
+    clear_translations()
+    domain = DBDomain(domain="messages")
+
+    app = Flask(__name__)
+    with app.test_request_context("/"):
+        first = domain.get_translations()
+        assert domain.get_translations() is first
+    with app.test_request_context("/"):
+        assert domain.get_translations() is first
+
+    mock_load.assert_called_once()
+    assert mock_locale.call_count == 2
+
+
+@patch("flaskpp.app.i18n.enabled", return_value=True)
+@patch("flaskpp.app.i18n._mo_mtime")
+@patch("flaskpp.app.i18n.get_locale", return_value="en")
+@patch("flaskpp.app.i18n.Translations.load")
+def test_dbdomain_reloads_changed_catalog_in_debug(mock_load, mock_locale, mock_mtime, mock_enabled):
+    mock_load.return_value = DummyTranslations()
+    mock_mtime.return_value = 1.0
+    clear_translations()
+    domain = DBDomain(domain="messages")
+
+    app = Flask(__name__)
+    with app.app_context():
+        domain.get_translations()
+        domain.get_translations()
+        assert mock_load.call_count == 1
+
+        mock_mtime.return_value = 2.0
+        domain.get_translations()
+        assert mock_load.call_count == 2
+
+
 def test_init_i18n_registers_jinja_globals():
     app = Flask(__name__)
     init_i18n(app)
 
     assert "_" in app.jinja_env.globals
     assert "ngettext" in app.jinja_env.globals
+
+
+def _db_app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+    return app
+
+
+def test_catalog_cached_until_entries_change():
+    app = _db_app()
+    with app.app_context():
+        db.create_all()
+        i18n_data.add_entry("en", "hello", "Hello!")
+        version = i18n_data.catalog_version("en")
+
+        assert i18n_data.get_catalog("en") == {"hello": "Hello!"}
+        with patch.object(db.session, "query") as mock_query:
+            assert i18n_data.get_catalog("en")["hello"] == "Hello!"
+            mock_query.assert_not_called()
+
+        i18n_data.add_entry("en", "bye", "Bye!")
+        assert i18n_data.catalog_version("en") > version
+        assert i18n_data.get_catalog("en")["bye"] == "Bye!"
+
+        i18n_data.remove_entries("hello")
+        assert "hello" not in i18n_data.get_catalog("en")
+
+
+def test_sync_drops_catalog_on_foreign_invalidation():
+    from flaskpp.app.utils import i18n_sync
+    import json, time
+
+    app = Flask(__name__)
+    app.config["BABEL_SYNC_URL"] = "memory://"
+    i18n_sync.init_sync(app)
+    try:
+        watcher = i18n_sync.local_broker.pubsub()
+        watcher.subscribe("fpp:i18n:invalidate")
+
+        version = i18n_data.invalidate_catalog("fr")
+        published = json.loads(watcher.get_message(timeout=1.0)["data"])
+        assert published["locale"] == "fr" and published["version"] == version
+        watcher.close()
+
+        i18n_sync.local_broker.publish("fpp:i18n:invalidate", json.dumps({
+            "origin": "other-worker", "domain": "messages", "locale": "fr", "version": 1
+        }))
+        deadline = time.monotonic() + 2
+        while i18n_data.catalog_version("fr") == version and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert i18n_data.catalog_version("fr") == version + 1
+    finally:
+        i18n_sync.stop_sync()
+
+
+def test_sync_resyncs_after_reconnect():
+    from flaskpp.app.utils import i18n_sync
+    import time
+
+    class FlakyClient:
+        def __init__(self):
+            self.connects = 0
+
+        def pubsub(self, ignore_subscribe_messages=True):
+            self.connects += 1
+            pubsub = i18n_sync.local_broker.pubsub()
+            if self.connects == 1:
+                pubsub.get_message = self.disconnect
+            return pubsub
+
+        def disconnect(self, **kwargs):
+            i18n_data._catalogs[("messages", "nl")] = (i18n_data.catalog_version("nl"), {"hello": "stale"})
+            raise ConnectionError("redis went away")
+
+    client = FlakyClient()
+    i18n_sync.init_sync(Flask(__name__), client)
+    try:
+        deadline = time.monotonic() + 5
+        while (client.connects < 2 or ("messages", "nl") in i18n_data._catalogs) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.connects >= 2
+        assert ("messages", "nl") not in i18n_data._catalogs
+    finally:
+        i18n_sync.stop_sync()
+
+
+def test_sync_ignores_replayed_versions():
+    from flaskpp.app.utils import i18n_sync
+    import json
+
+    message = json.dumps({"origin": "worker-b", "domain": "messages", "locale": "pt", "version": 3})
+    version = i18n_data.catalog_version("pt")
+    i18n_sync._handle(message)
+    i18n_sync._handle(message)
+    assert i18n_data.catalog_version("pt") == version + 1
+
+
+def test_sync_skips_malformed_invalidations():
+    from flaskpp.app.utils import i18n_sync
+
+    i18n_data._catalogs[("messages", "sv")] = (i18n_data.catalog_version("sv"), {"hello": "hej"})
+    for raw in ("[]", "null", '{"origin": "x"}', '{"locale": 3}', '{"locale": "sv", "domain": ["x"]}', b"\xff"):
+        i18n_sync._handle(raw)
+    assert ("messages", "sv") in i18n_data._catalogs
+
+
+def test_cli_data_app_publishes_invalidations(tmp_path):
+    from flaskpp.app import cli
+    from flaskpp.app.utils import i18n_sync
+    import json, os
+
+    (tmp_path / "demo.conf").write_text(
+        f"[database]\nDATABASE_URL = sqlite:///{tmp_path / 'cli.db'}\n"
+        "[extensions]\nEXT_BABEL = 1\n[features]\nBABEL_SYNC = 1\nBABEL_SYNC_URL = memory://\n"
+    )
+    watcher = i18n_sync.local_broker.pubsub()
+    watcher.subscribe("fpp:i18n:invalidate")
+    try:
+        with patch.object(cli, "conf_path", tmp_path), patch.dict(os.environ):
+            app = cli._data_app("demo")
+            assert i18n_sync._state["listener"] is None
+            with app.app_context():
+                db.create_all()
+                i18n_data.import_entries(iter([{"locale": "sv", "key": "hi", "text": "Hej"}]))
+
+        published = json.loads(watcher.get_message(timeout=1.0)["data"])
+        assert published["locale"] == "sv" and published["origin"] == i18n_sync._origin
+    finally:
+        watcher.close()
+        i18n_sync.stop_sync()
+
+
+def test_bulk_import_upserts_and_deletes():
+    app = _db_app()
+    with app.app_context():
+        db.create_all()
+        rows = [{"locale": "es", "key": f"k{i}", "text": f"v{i}"} for i in range(25)]
+        assert i18n_data.import_entries(iter(rows), batch_size=10) == 25
+        assert i18n_data.get_catalog("es")["k3"] == "v3"
+
+        i18n_data.import_entries([{"locale": "es", "key": "k3", "text": "changed"}])
+        assert i18n_data.get_catalog("es")["k3"] == "changed"
+        assert len(list(i18n_data.export_entries(locale="es"))) == 25
+
+        assert i18n_data.delete_entries(["k0", "k1", "missing"], locale="es") == 2
+        assert "k0" not in i18n_data.get_catalog("es")
+
+
+class LocaleTranslations(Translations):
+    def __init__(self, locale):
+        super().__init__()
+        self.locale = locale
+
+    def gettext(self, message):
+        return f"{self.locale}:{message}"
+
+
+@patch("flaskpp.app.i18n.get_catalog", return_value={})
+def test_template_folding_compiles_per_locale(mock_catalog):
+    from jinja2 import DictLoader
+    from flaskpp.app.i18n import LocaleTemplateLoader
+
+    class FoldingApp(Flask):
+        def create_global_jinja_loader(self):
+            return LocaleTemplateLoader(self)
+
+    translations = {
+        locale: DBMergedTranslations(LocaleTranslations(locale), "messages", locale)
+        for locale in ("en", "de")
+    }
+    current = {"locale": "en"}
+    domain = MagicMock()
+    domain.get_translations.side_effect = lambda: translations[current["locale"]]
+
+    app = FoldingApp(__name__)
+    app.extensions["babel_domain"] = domain
+    app.jinja_loader = DictLoader({"page.html": "{{ _('hello') }}|{{ x._('raw') }}"})
+    init_i18n(app)
+
+    compiled = []
+    original = app.jinja_env.compile
+    app.jinja_env.compile = lambda *a, **k: compiled.append(a) or original(*a, **k)
+
+    from flask import render_template
+    x = {"_": lambda s: s}
+    with app.app_context():
+        assert render_template("page.html", x=x) == "en:hello|raw"
+        assert render_template("page.html", x=x) == "en:hello|raw"
+        current["locale"] = "de"
+        assert render_template("page.html", x=x) == "de:hello|raw"
+        assert len(compiled) == 2
+
+        i18n_data.invalidate_catalog("de")
+        assert render_template("page.html", x=x) == "de:hello|raw"
+        assert len(compiled) == 3
+
+
+@patch("flaskpp.app.i18n.get_catalog", return_value={})
+def test_template_folding_keeps_newstyle_gettext(mock_catalog):
+    from jinja2 import DictLoader
+    from markupsafe import Markup
+    from flask import render_template
+    from flaskpp.app.i18n import LocaleTemplateLoader
+
+    class FoldingApp(Flask):
+        def create_global_jinja_loader(self):
+            return LocaleTemplateLoader(self)
+
+    rendered = []
+    for app_class in (Flask, FoldingApp):
+        domain = MagicMock()
+        domain.get_translations.return_value = DBMergedTranslations(LocaleTranslations("en"), "messages", "en")
+        app = app_class(__name__)
+        app.extensions["babel_domain"] = domain
+        app.jinja_loader = DictLoader({"page.html": "{{ _('<b>Hi</b> 100%%') }}|{{ gettext('<b>Hi</b> 100%%') }}"})
+        init_i18n(app)
+        app.jinja_env.globals["_"] = domain.get_translations().gettext
+        app.jinja_env.globals["gettext"] = lambda s, **variables: Markup(s) % variables
+        with app.app_context():
+            rendered.append(render_template("page.html"))
+
+    assert rendered[0] == rendered[1] == "en:&lt;b&gt;Hi&lt;/b&gt; 100%%|<b>Hi</b> 100%"
+
+
+def test_socket_batch_translation():
+    from flaskpp.app.socket import default_handlers
+
+    result = default_handlers["_batch"]({"keys": ["a", "b"], "plurals": [["one", "many", 2]]})
+    assert result["keys"] == {"a": "a", "b": "b"}
+    assert result["plurals"] == ["many"]
+
+
+def test_socket_batch_rejects_malformed_plurals():
+    from flaskpp.app.socket import default_handlers, SocketRejected
+
+    result = default_handlers["_batch"]({"keys": ["a", 3], "plurals": [["one", "many"], ["one", "many", "2"],
+                                                                         "x", ["one", "many", 1]]})
+    assert result["keys"] == {"a": "a"}
+    assert result["plurals"] == [None, None, None, "one"]
+
+    with pytest.raises(SocketRejected):
+        default_handlers["_batch"]({"keys": "a"})
+
+
+def test_socket_batch_is_capped():
+    from flaskpp.app.socket import default_handlers, SocketRejected
+    from flaskpp.app.utils.translating import BATCH_LIMIT
+
+    keys = [f"k{i}" for i in range(BATCH_LIMIT)]
+    assert len(default_handlers["_batch"]({"keys": keys})["keys"]) == BATCH_LIMIT
+
+    with pytest.raises(SocketRejected):
+        default_handlers["_batch"]({"keys": keys + ["one more"]})
+    with pytest.raises(SocketRejected):
+        default_handlers["_batch"]({"keys": keys[1:], "plurals": [["one", "many", 1], ["one", "many", 2]]})
+
+
+@patch("flaskpp.app.i18n.get_catalog", return_value={"hello": "Hallo"})
+def test_translation_bundle_endpoint(mock_catalog):
+    from flaskpp import _fpp_default
+    from flaskpp.app.i18n import bundle_url
+
+    clear_translations()
+    app = Flask(__name__)
+    app.config["SUPPORTED_LOCALES"] = "en;de"
+    app.extensions["babel_domain"] = DBDomain()
+    app.register_blueprint(_fpp_default)
+    client = app.test_client()
+
+    with app.test_request_context("/"):
+        url = bundle_url(locale="de")
+    assert url.startswith("/fpp-i18n/de/messages.") and url.endswith(".json")
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json["messages"] == {"hello": "Hallo"}
+    assert "immutable" in response.headers["Cache-Control"]
+
+    etag = response.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/fpp-i18n/de/messages.outdated.json").status_code == 302
+    assert client.get("/fpp-i18n/xx/messages.outdated.json").status_code == 404
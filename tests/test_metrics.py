@@ -0,0 +1,99 @@
+from flask import Flask
+import os
+
+from flaskpp.app import metrics
+
+
+def test_metrics_endpoint_aggregates_workers(tmp_path, monkeypatch):
+    for key in ("EXT_SQLALCHEMY", "EXT_CACHE", "EXT_SOCKET"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setitem(metrics._state, "writer", object())
+
+    app = Flask(__name__)
+    app.config["METRICS_DIR"] = str(tmp_path)
+    metrics.init_metrics(app)
+    metrics._state["dir"] = tmp_path
+    app.route("/ping")(lambda: "pong")
+
+    try:
+        client = app.test_client()
+        client.get("/ping")
+        client.get("/ping")
+        (tmp_path / "fpp-999999999.json").write_text(
+            '{"counter": [["fpp_http_responses_total", [["blueprint", ""], ["endpoint", "<lambda>"], ["status", 200]], 3]],'
+            ' "gauge": [["fpp_http_requests_in_flight", [], 5]], "histogram": []}'
+        )
+        body = client.get("/metrics").get_data(as_text=True)
+    finally:
+        metrics._state.update(enabled=False, dir=None)
+
+    assert 'fpp_http_responses_total{blueprint="",endpoint="<lambda>",status="200"} 5' in body
+    assert 'fpp_http_request_duration_seconds_count{blueprint="",endpoint="<lambda>"} 2' in body
+    assert "fpp_http_requests_in_flight 1" in body
+    assert f"fpp-{os.getpid()}.json" in os.listdir(tmp_path)
+
+
+def test_cache_lookups_are_counted_at_the_extension(tmp_path, monkeypatch):
+    from flaskpp.app.extensions import cache
+
+    for key in ("EXT_SQLALCHEMY", "EXT_SOCKET"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setitem(metrics._state, "writer", object())
+
+    app = Flask(__name__)
+    app.config.update(METRICS_DIR=str(tmp_path), CACHE_TYPE="SimpleCache")
+    cache.init_app(app)
+    metrics.init_metrics(app)
+    metrics._state["dir"] = tmp_path
+
+    @app.route("/lookup")
+    def lookup():
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        cache.get_many("a", "b", "c")
+        cache.has("a")
+        return "ok"
+
+    try:
+        client = app.test_client()
+        client.get("/lookup")
+        body = client.get("/metrics").get_data(as_text=True)
+    finally:
+        metrics._state.update(enabled=False, dir=None)
+
+    backend = app.extensions["cache"][cache]
+    assert "get" not in vars(backend)
+    assert 'fpp_cache_requests_total{result="hit"} 3' in body
+    assert 'fpp_cache_requests_total{result="miss"} 3' in body
+
+
+def test_metrics_route_only_exists_when_enabled():
+    from flaskpp import _fpp_default
+
+    app = Flask(__name__)
+    app.register_blueprint(_fpp_default)
+    app.route("/metrics")(lambda: "own metrics page")
+    assert app.test_client().get("/metrics").get_data(as_text=True) == "own metrics page"
+
+
+def test_stale_worker_files_are_cleared(tmp_path, monkeypatch):
+    for key in ("EXT_SQLALCHEMY", "EXT_SOCKET"):
+        monkeypatch.delenv(key, raising=False)
+    monkeypatch.setitem(metrics._state, "writer", None)
+    own = tmp_path / f"fpp-{os.getpid()}.json"
+    own.write_text('{"counter": [["fpp_stale_total", [], 7]], "gauge": [], "histogram": []}')
+    (tmp_path / "fpp-999999999.json").write_text("{}")
+    (tmp_path / "notes.txt").write_text("keep")
+
+    app = Flask(__name__)
+    app.config.update(METRICS_DIR=str(tmp_path), METRICS_FLUSH_INTERVAL=3600)
+    try:
+        metrics.init_metrics(app)
+        assert not own.exists()
+        assert "fpp_stale_total" not in app.test_client().get("/metrics").get_data(as_text=True)
+    finally:
+        metrics._state.update(enabled=False, dir=None)
+
+    metrics.clear_metrics_dir(tmp_path)
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["notes.txt"]
@@ -0,0 +1,28 @@
+from flask import Flask
+import time
+
+from flaskpp.app import profiler
+
+
+def test_signed_header_profiles_request(tmp_path):
+    app = Flask(__name__)
+    app.config.update(SECRET_KEY="secret", PROFILING="header", PROFILE_DIR=str(tmp_path), PROFILE_INTERVAL=0.001)
+    profiler.init_profiler(app)
+
+    @app.route("/slow")
+    def slow():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return "done"
+
+    client = app.test_client()
+    client.get("/slow")
+    client.get("/slow", headers={"X-Fpp-Profile": "forged"})
+    assert not list(tmp_path.iterdir())
+
+    client.get("/slow", headers={"X-Fpp-Profile": profiler.profile_token("secret")})
+    stacks = profiler.read_stacks(tmp_path / "slow.collapsed")
+    assert sum(stacks.values()) > 5
+    assert any(stack.endswith("slow (test_profiler.py:12)") for stack in stacks)
+    assert not profiler._active
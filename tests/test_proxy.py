@@ -0,0 +1,206 @@
+import asyncio, struct, h11, pytest
+
+from flaskpp.fpp_node import proxy
+
+
+def _handshake(head: bytes, extra: bytes = b"Sec-WebSocket-Protocol: vite-hmr\r\n") -> bytes:
+    key = next(line.split(b":", 1)[1].strip() for line in head.split(b"\r\n")
+               if line.lower().startswith(b"sec-websocket-key:"))
+    return (b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + proxy._accept_key(key.decode()).encode() + b"\r\n" + extra + b"\r\n")
+
+
+def _fragment(opcode: int, payload: bytes, fin: bool) -> bytes:
+    return bytes([(0x80 if fin else 0) | opcode, len(payload)]) + payload
+
+
+async def _echo(reader, writer, head):
+    writer.write(_handshake(head))
+    writer.write(proxy._frame(0x1, b'{"type":"connected"}', masked=False))
+    while True:
+        _, opcode, payload = await proxy._read_frame(reader)
+        if opcode == 0x8:
+            writer.write(proxy._frame(0x8, payload, masked=False))
+            return writer.close()
+        writer.write(proxy._frame(opcode, b"echo:" + payload, masked=False))
+
+
+async def _upstream(connections: list, websocket=_echo):
+    async def handle(reader, writer):
+        connections.append(writer)
+        head = await reader.readuntil(b"\r\n\r\n")
+        if b"upgrade: websocket" in head.lower():
+            return await websocket(reader, writer, head)
+
+        conn = h11.Connection(h11.SERVER)
+        conn.receive_data(head)
+        while True:
+            event = conn.next_event()
+            if event is h11.NEED_DATA:
+                data = await reader.read(65536)
+                if not data:
+                    return writer.close()
+                conn.receive_data(data)
+                continue
+            if isinstance(event, h11.ConnectionClosed):
+                return writer.close()
+            if isinstance(event, h11.Request):
+                request, body = event, b""
+            elif isinstance(event, h11.Data):
+                body += event.data
+            elif isinstance(event, h11.EndOfMessage):
+                headers = dict(request.headers)
+                writer.write(conn.send(h11.Response(status_code=200, headers=[
+                    (b"transfer-encoding", b"chunked"), (b"keep-alive", b"timeout=5"),
+                    (b"x-seen-host", headers[b"host"]), (b"x-seen-upgrade", headers.get(b"upgrade", b"-")),
+                ])))
+                for part in (request.method + b" ", request.target + b" ", body):
+                    writer.write(conn.send(h11.Data(data=part)))
+                    await writer.drain()
+                writer.write(conn.send(h11.EndOfMessage()))
+                conn.start_next_cycle()
+
+    server = await asyncio.start_server(handle, "localhost", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _call(app, scope, messages):
+    queue, sent = asyncio.Queue(), []
+    for message in messages:
+        queue.put_nowait(message)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, queue.get, send)
+    return sent
+
+
+def _http(path, method="GET", headers=()):
+    return {"type": "http", "method": method, "path": path, "raw_path": path.encode(), "query_string": b"t=1",
+            "headers": [(b"host", b"app.local"), *headers], "client": ("10.0.0.1", 1234)}
+
+
+def test_proxy_streams_http_and_reuses_connections():
+    async def run():
+        connections = []
+        server, port = await _upstream(connections)
+        passthrough = []
+
+        async def app(scope, receive, send):
+            passthrough.append(scope["path"])
+
+        vite_proxy = proxy.ViteDevProxy(app, {"/shop/vite": port})
+        sent = await _call(vite_proxy, _http("/shop/vite/main.js", headers=[(b"upgrade", b"h2c")]),
+                           [{"type": "http.request", "body": b""}])
+        start = sent[0]
+        headers = dict(start["headers"])
+        assert start["status"] == 200
+        assert headers[b"x-seen-host"] == f"localhost:{port}".encode() and headers[b"x-seen-upgrade"] == b"-"
+        assert b"transfer-encoding" not in headers and b"keep-alive" not in headers
+        assert b"".join(m.get("body", b"") for m in sent[1:]) == b"GET /shop/vite/main.js?t=1 "
+        assert len([m for m in sent if m["type"] == "http.response.body"]) > 2
+
+        sent = await _call(vite_proxy, _http("/shop/vite/api", "POST"), [
+            {"type": "http.request", "body": b"a", "more_body": True},
+            {"type": "http.request", "body": b"b"},
+        ])
+        assert b"".join(m.get("body", b"") for m in sent[1:]).endswith(b" ab")
+        assert len(connections) == 1
+
+        await _call(vite_proxy, _http("/other"), [])
+        assert passthrough == ["/other"]
+        server.close()
+
+    asyncio.run(run())
+
+
+def test_proxy_tunnels_websockets():
+    async def run():
+        connections = []
+        server, port = await _upstream(connections)
+        vite_proxy = proxy.ViteDevProxy(None, {"/vite": port})
+        scope = {"type": "websocket", "path": "/vite/", "raw_path": b"/vite/", "query_string": b"token=x",
+                 "headers": [(b"host", b"app.local"), (b"sec-websocket-key", b"abc")], "subprotocols": ["vite-hmr"]}
+        queue, sent = asyncio.Queue(), []
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "websocket.send" and message["text"].startswith("echo:"):
+                queue.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+        queue.put_nowait({"type": "websocket.connect"})
+        queue.put_nowait({"type": "websocket.receive", "text": "ping" * 100})
+        await asyncio.wait_for(vite_proxy(scope, queue.get, send), 5)
+
+        assert sent[0] == {"type": "websocket.accept", "subprotocol": "vite-hmr"}
+        assert sent[1] == {"type": "websocket.send", "text": '{"type":"connected"}'}
+        assert sent[2] == {"type": "websocket.send", "text": "echo:" + "ping" * 100}
+        server.close()
+
+    asyncio.run(run())
+
+
+def _ws_scope(subprotocols=("vite-hmr",)):
+    return {"type": "websocket", "path": "/vite/", "raw_path": b"/vite/", "query_string": b"",
+            "headers": [(b"host", b"app.local")], "subprotocols": list(subprotocols)}
+
+
+def test_proxy_reassembles_fragments_answers_pings_and_forwards_close():
+    seen = []
+
+    async def upstream(reader, writer, head):
+        writer.write(_handshake(head))
+        writer.write(_fragment(0x1, b"hel", False) + _fragment(0x9, b"beat", True)
+                     + _fragment(0x0, b"lo ", False) + _fragment(0x0, b"world", True))
+        writer.write(_fragment(0x2, b"\x00\x01", False) + _fragment(0x0, b"\x02", True))
+        seen.append(await proxy._read_frame(reader))
+        writer.write(_fragment(0x1, b"unfinished", False))
+        writer.write(proxy._frame(0x8, struct.pack("!H", 4000) + b"bye", masked=False))
+        seen.append(await proxy._read_frame(reader))
+        writer.close()
+
+    async def run():
+        server, port = await _upstream([], upstream)
+        queue, sent = asyncio.Queue(), []
+
+        async def send(message):
+            sent.append(message)
+
+        queue.put_nowait({"type": "websocket.connect"})
+        await asyncio.wait_for(proxy.ViteDevProxy(None, {"/vite": port})(_ws_scope(), queue.get, send), 5)
+        server.close()
+        return sent
+
+    sent = asyncio.run(run())
+    assert sent == [
+        {"type": "websocket.accept", "subprotocol": "vite-hmr"},
+        {"type": "websocket.send", "text": "hello world"},
+        {"type": "websocket.send", "bytes": b"\x00\x01\x02"},
+        {"type": "websocket.close", "code": 4000, "reason": "bye"},
+    ]
+    assert seen == [(True, 0xA, b"beat"), (True, 0x8, struct.pack("!H", 4000))]
+
+
+@pytest.mark.parametrize("extra", [
+    b"Sec-WebSocket-Protocol: graphql-ws\r\n",
+    b"Sec-WebSocket-Protocol: vite-hmr\r\nSec-WebSocket-Extensions: permessage-deflate\r\n",
+])
+def test_proxy_rejects_unnegotiated_upstream_handshakes(extra):
+    async def upstream(reader, writer, head):
+        writer.write(_handshake(head, extra))
+        await writer.drain()
+
+    async def run():
+        server, port = await _upstream([], upstream)
+        queue, sent = asyncio.Queue(), []
+
+        async def send(message):
+            sent.append(message)
+
+        queue.put_nowait({"type": "websocket.connect"})
+        await asyncio.wait_for(proxy.ViteDevProxy(None, {"/vite": port})(_ws_scope(), queue.get, send), 5)
+        server.close()
+        return sent
+
+    assert asyncio.run(run()) == [{"type": "websocket.close", "code": 1011}]
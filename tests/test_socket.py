@@ -0,0 +1,318 @@
+from flask import Flask, current_app
+import asyncio, threading
+
+from flaskpp.app import socket as fpp_socket
+from flaskpp.app.socket import (
+    default_event, init_dispatch, dispatch_stats, socket_middleware, SocketRejected, current_sid
+)
+from flaskpp.app.utils.processing import handlers
+
+
+def _app():
+    app = Flask(__name__)
+    app.config["SOCKETIO_HANDLER_THREADS"] = 4
+    init_dispatch(app)
+    return app
+
+
+def _emit(event, payload=None):
+    return handlers["socket_event_handler"]("sid", {"event": event, "payload": payload})
+
+
+def test_sync_handler_runs_off_loop_with_app_context():
+    app = _app()
+
+    @default_event("test_sync")
+    def handle(payload):
+        return threading.current_thread().name, current_app.name, payload
+
+    async def run():
+        return await _emit("test_sync", 1), threading.current_thread().name
+
+    (thread, app_name, payload), loop_thread = asyncio.run(run())
+    assert thread.startswith("fpp-socket") and thread != loop_thread
+    assert app_name == app.name and payload == 1
+
+
+def test_async_handler_is_awaited():
+    _app()
+
+    @default_event("test_async")
+    async def handle(payload):
+        await asyncio.sleep(0)
+        return payload * 2
+
+    assert asyncio.run(_emit("test_async", 21)) == 42
+
+
+def test_event_concurrency_limit():
+    _app()
+    active = {"now": 0, "max": 0}
+
+    @default_event("test_limited", max_concurrency=2)
+    async def handle(_):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(_emit("test_limited") for _ in range(6)))
+
+    asyncio.run(run())
+    assert active["max"] == 2
+    assert dispatch_stats()["namespaces"]["/"]["test_limited"]["handled"] == 6
+
+
+def test_handler_errors_are_reported():
+    _app()
+
+    @default_event("test_error")
+    def handle(_):
+        raise ValueError("boom")
+
+    assert asyncio.run(_emit("test_error")) == {"error": "Error while handling socket event."}
+    assert asyncio.run(_emit("test_missing_event")) == {"error": "Error while handling socket event."}
+    assert fpp_socket._stats["/"]["test_error"]["failed"] == 1
+
+
+def test_handlers_reuse_connection_request_context():
+    from flask import request, g
+    from flaskpp.app.utils.translating import get_locale
+
+    class Server:
+        def get_environ(self, sid, namespace="/"):
+            return {
+                "PATH_INFO": "/socket.io/",
+                "HTTP_COOKIE": "lang=de",
+                "HTTP_ACCEPT_LANGUAGE": "en",
+                "asgi.scope": {"client": ("10.0.0.1", 1234)},
+            }
+
+    app = Flask(__name__)
+    app.config["SUPPORTED_LOCALES"] = "en;de"
+    init_dispatch(app, Server())
+
+    @default_event("test_context")
+    def handle(_):
+        leaked = g.get("marker")
+        g.marker = True
+        return get_locale(), request.remote_addr, id(request._get_current_object()), leaked
+
+    async def run():
+        return await _emit("test_context"), await _emit("test_context")
+
+    first, second = asyncio.run(run())
+    assert first[:2] == ("de", "10.0.0.1")
+    assert first[2] == second[2]
+    assert first[3] is None and second[3] is None
+
+    handlers["socket_disconnect_handler"]("sid", "client disconnect")
+    assert "sid" not in fpp_socket._contexts
+
+
+def test_namespaced_routes_and_middleware():
+    _app()
+    seen = []
+
+    @socket_middleware(namespace="/test_ns")
+    def tag(sid, event, payload):
+        seen.append((sid, event))
+        if payload == "deny":
+            raise SocketRejected("Denied.")
+        return {"value": payload}
+
+    @default_event("echo", namespace="/test_ns")
+    def echo(payload):
+        return payload, current_sid()
+
+    def emit(payload):
+        return handlers["socket_event_handler"]("sid", {"event": "echo", "payload": payload}, namespace="/test_ns")
+
+    assert asyncio.run(emit(1)) == ({"value": 1}, "sid")
+    assert asyncio.run(emit("deny")) == {"error": "Denied."}
+    assert asyncio.run(_emit("echo")) == {"error": "Error while handling socket event."}
+    assert seen == [("sid", "echo"), ("sid", "echo")]
+    assert dispatch_stats()["namespaces"]["/test_ns"]["echo"]["rejected"] == 1
+
+
+def test_message_queue_fans_out_in_batches():
+    from socketio import AsyncServer
+    from flaskpp.app.utils import socket_queue
+
+    app = Flask(__name__)
+    app.config["SOCKETIO_MESSAGE_QUEUE"] = "memory://"
+    app.config["SOCKETIO_QUEUE_CHANNEL"] = "test-fanout"
+    fpp_socket._pool["loop"] = None
+
+    async def run():
+        sender = socket_queue.queue_manager("memory://", "test-fanout")
+        sender.set_server(AsyncServer(async_mode="asgi"))
+        receiver = socket_queue.init_queue(app, AsyncServer(async_mode="asgi"))
+        received = []
+
+        async def handle(message):
+            received.append(message["event"])
+        receiver._handle_emit = handle
+        receiver.initialize()
+        await asyncio.sleep(0)
+
+        published = []
+        publish = socket_queue.local_queue.publish
+        socket_queue.local_queue.publish = lambda channel, data: published.append(data) or publish(channel, data)
+        try:
+            for i in range(5):
+                await sender.emit(f"event_{i}", i)
+            await sender.flush()
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: socket_queue.broadcast("from_thread", room="room").result(5)
+            )
+            for _ in range(50):
+                if len(received) == 6:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            socket_queue.local_queue.publish = publish
+            receiver.thread.cancel()
+        return received, published
+
+    received, published = asyncio.run(run())
+    assert received == [f"event_{i}" for i in range(5)] + ["from_thread"]
+    assert len(published) == 2
+
+
+def test_broadcast_uses_loop_bound_on_connect():
+    from flaskpp.app.utils import socket_queue
+
+    class Server:
+        def __init__(self):
+            self.emitted = []
+
+        async def emit(self, event, data=None, **kwargs):
+            self.emitted.append((event, data, threading.current_thread().name))
+
+    server = Server()
+    init_dispatch(Flask(__name__), server)
+    socket_queue._state.update(url=None, server=None)
+
+    async def run():
+        handlers["socket_connect_handler"]("sid", {})
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: socket_queue.broadcast("hello", 1).result(5)
+        )
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(run())
+    assert server.emitted == [("hello", 1, loop_thread)]
+
+
+def test_compact_frames_use_interned_event_ids():
+    app = Flask(__name__)
+    app.config["SOCKETIO_COMPACT_FRAMES"] = True
+    init_dispatch(app)
+
+    @default_event("frame_a", namespace="/test_frames")
+    def a(payload):
+        return ("a", payload)
+
+    @default_event("frame_b", namespace="/test_frames")
+    def b(payload):
+        return ("b", payload)
+
+    def emit(data):
+        return asyncio.run(handlers["socket_event_handler"]("sid", data, namespace="/test_frames"))
+
+    table = emit({"event": "_events"})
+    events, version = table["events"], table["version"]
+    assert events == ["frame_a", "frame_b"]
+    assert emit([version, events.index("frame_b"), 7]) == ("b", 7)
+    assert emit({"event": "frame_a", "payload": 1}) == ("a", 1)
+    assert emit([version, 5, None]) == {"error": "Unknown socket event id."}
+
+    @default_event("frame_0", namespace="/test_frames")
+    def zero(payload):
+        return ("0", payload)
+
+    assert emit([version, events.index("frame_b"), 7]) == {"error": "Stale socket event table."}
+    table = emit({"event": "_events"})
+    assert table["events"] == ["frame_0", "frame_a", "frame_b"]
+    assert emit([table["version"], 2, 7]) == ("b", 7)
+
+
+def test_compact_frames_are_opt_in():
+    _app()
+
+    @default_event("plain_a", namespace="/test_plain")
+    def a(payload):
+        return ("a", payload)
+
+    def emit(data):
+        return asyncio.run(handlers["socket_event_handler"]("sid", data, namespace="/test_plain"))
+
+    assert emit({"event": "_events"}) == {"events": None}
+    assert emit([1, 0, 7]) == {"error": "Compact socket frames are disabled."}
+    assert emit({"event": "plain_a", "payload": 7}) == ("a", 7)
+
+
+def test_flow_control_is_off_by_default():
+    from flaskpp.app.config.default import DefaultConfig
+    from flaskpp.app.utils import socket_flow
+
+    app = Flask(__name__)
+    app.config.from_object(DefaultConfig)
+    socket_flow.init_flow(app)
+    assert all(socket_flow.allow_event("sid") for _ in range(1000))
+    assert socket_flow._settings["high_water"] == 0
+
+
+def test_flow_control_limits_and_evicts():
+    from types import SimpleNamespace
+    from flaskpp.app.utils import socket_flow
+
+    app = Flask(__name__)
+    app.config.update(
+        SOCKETIO_RATE_LIMIT=1, SOCKETIO_RATE_BURST=2,
+        SOCKETIO_OUTBOUND_HIGH_WATER=2, SOCKETIO_SLOW_CONSUMER_TIMEOUT=0.05
+    )
+    socket_flow.init_flow(app)
+    assert [socket_flow.allow_event("flow") for _ in range(3)] == [True, True, False]
+
+    backlog = {"size": 0}
+    sent, disconnected = [], []
+
+    class Server:
+        manager = SimpleNamespace(eio_sid_from_sid=lambda sid, ns: "eio")
+        eio = SimpleNamespace(sockets={"eio": SimpleNamespace(queue=SimpleNamespace(qsize=lambda: backlog["size"]))})
+
+        async def emit(self, event, data, to=None, namespace=None):
+            sent.append((event, data))
+
+        async def disconnect(self, sid, namespace=None):
+            disconnected.append(sid)
+
+    fpp_socket._pool["server"] = Server()
+
+    async def run():
+        assert await socket_flow.send("flow", "tick", 1)
+        backlog["size"] = 5
+        assert not await socket_flow.send("flow", "tick", 2)
+        assert await socket_flow.send("flow", "state", 1, policy="coalesce")
+        assert await socket_flow.send("flow", "state", 2, policy="coalesce")
+        backlog["size"] = 0
+        await asyncio.sleep(0.1)
+
+        backlog["size"] = 5
+        await socket_flow.send("flow", "tick", 3)
+        await asyncio.sleep(0.1)
+        await socket_flow.send("flow", "tick", 4)
+
+    try:
+        asyncio.run(run())
+    finally:
+        fpp_socket._pool["server"] = None
+        socket_flow._settings.update(rate=0.0, high_water=0)
+
+    assert sent == [("tick", 1), ("state", 2)]
+    assert disconnected == ["flow"]
+    stats = socket_flow.flow_stats()
+    assert stats["limited"] >= 1 and stats["coalesced"] >= 1 and stats["evicted"] >= 1
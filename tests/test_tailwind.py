@@ -0,0 +1,76 @@
+from unittest.mock import patch
+from types import SimpleNamespace
+
+from flaskpp import tailwind
+
+
+def _project(tmp_path):
+    for css in (tmp_path / "static" / "css", tmp_path / "modules" / "shop" / "static" / "css"):
+        css.mkdir(parents=True)
+        (css / "tailwind_raw.css").write_text('@import "tailwindcss";\n@source not "../../vite";\n')
+    with (tmp_path / "static" / "css" / "tailwind_raw.css").open("a") as f:
+        f.write('@source not "../../modules";\n@source not "../../instance";\n')
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "index.html").write_text("<p class='p-4'></p>")
+    (tmp_path / "modules" / "shop" / "templates").mkdir()
+    (tmp_path / "modules" / "shop" / "templates" / "cart.html").write_text("<p class='m-2'></p>")
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "huge.py").write_text("x = 1")
+    return SimpleNamespace(root_path=str(tmp_path), instance_path=str(tmp_path / "instance"))
+
+
+def test_tailwind_builds_only_changed_targets(tmp_path):
+    app = _project(tmp_path)
+    built = []
+
+    def fake_build(in_file, out, cwd=None):
+        if not in_file.is_relative_to(tmp_path):
+            return
+        built.append(in_file.parent.relative_to(tmp_path).as_posix())
+        out.write_text("/* css */")
+
+    with patch.object(tailwind, "_build", fake_build):
+        tailwind.generate_tailwind_css(app)
+        assert sorted(built) == ["modules/shop/static/css", "static/css"]
+
+        built.clear()
+        tailwind.generate_tailwind_css(app)
+        assert built == []
+
+        (tmp_path / ".venv" / "lib" / "huge.py").write_text("x = 2")
+        tailwind.generate_tailwind_css(app)
+        assert built == []
+
+        (tmp_path / "modules" / "shop" / "templates" / "cart.html").write_text("<p class='m-4'></p>")
+        tailwind.generate_tailwind_css(app)
+        assert built == ["modules/shop/static/css"]
+
+        built.clear()
+        (tmp_path / "static" / "css" / "tailwind.css").unlink()
+        tailwind.generate_tailwind_css(app)
+        assert built == ["static/css"]
+
+
+def test_tailwind_sources_are_pruned(tmp_path):
+    _project(tmp_path)
+    sources = tailwind._sources(tmp_path / "static" / "css" / "tailwind_raw.css")
+    names = {source.relative_to(tmp_path).as_posix() for source in sources}
+    assert "templates/index.html" in names
+    assert not any(name.startswith((".venv", "modules")) for name in names)
+
+    (tmp_path / "instance").mkdir()
+    (tmp_path / "instance" / "notes.md").write_text("- p-4")
+    (tmp_path / "migrations").mkdir()
+    (tmp_path / "migrations" / "env.py").write_text("x = 1")
+    sources = tailwind._sources(tmp_path / "static" / "css" / "tailwind_raw.css")
+    names = {source.relative_to(tmp_path).as_posix() for source in sources}
+    assert "instance/notes.md" not in names and "migrations/env.py" in names
+
+    assets = tmp_path / "builds" / "1" / "frontends" / "vite" / "dist" / "assets"
+    assets.mkdir(parents=True)
+    (assets / "index-abc.js").write_text("const c = 'p-8';")
+    sources = tailwind._sources(tmp_path / "static" / "css" / "tailwind_raw.css")
+    assert not any(source.is_relative_to(tmp_path / "builds") for source in sources)
+
+    module_sources = tailwind._sources(tmp_path / "modules" / "shop" / "static" / "css" / "tailwind_raw.css")
+    assert [source.name for source in module_sources if source.suffix == ".html"] == ["cart.html"]
@@ -0,0 +1,215 @@
+from unittest.mock import patch, MagicMock
+from flask import Flask
+import json, sys, pytest
+
+from flaskpp.fpp_node import vite
+
+
+def _app(tmp_path, name="shop"):
+    (tmp_path / name).mkdir(exist_ok=True)
+    app = Flask(name, root_path=str(tmp_path / name))
+    app.url_prefix = ""
+    return app
+
+
+def _fake_build(calls):
+    def popen(cmd, cwd, env):
+        conf = (vite.home / cmd[-1]).read_text()
+        root = conf.split('root: "')[1].split('"')[0]
+        manifest = vite.Path(root) / "dist" / ".vite" / "manifest.json"
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        manifest.write_text(json.dumps({"main.js": {"file": "assets/main.js", "isEntry": True}}))
+        calls.append(root)
+        return MagicMock(returncode=0)
+    return popen
+
+
+def test_vite_build_is_reused_until_sources_change(tmp_path):
+    calls = []
+    with patch.object(vite, "home", tmp_path), patch.object(vite, "enabled", return_value=False), \
+            patch.object(vite.subprocess, "Popen", _fake_build(calls)):
+        engine = vite.Frontend(_app(tmp_path))
+        engine.loader.join()
+        assert len(calls) == 1
+        assert engine.manifest["main.js"].file == "assets/main.js"
+
+        engine = vite.Frontend(_app(tmp_path))
+        assert len(calls) == 1 and engine.loader is None and engine.built
+        assert "assets/main.js" in engine.vite("main.js")
+
+        (tmp_path / "shop" / "vite" / "src" / "main.css").write_text("@import 'tailwindcss';\n.x {}")
+        engine = vite.Frontend(_app(tmp_path))
+        engine.loader.join()
+        assert len(calls) == 2
+
+
+def _fake_bundle(tmp_path, calls):
+    def popen(cmd, cwd, env):
+        calls.append(cmd[-1])
+        dist = tmp_path / "app" / "vite" / "dist"
+        (dist / ".vite").mkdir(parents=True, exist_ok=True)
+        (dist / ".vite" / "manifest.json").write_text(json.dumps({
+            "vite/main.js": {"file": "assets/app.js", "isEntry": True, "imports": ["_vendor.js"]},
+            "modules/shop/vite/main.js": {"file": "assets/shop.js", "isEntry": True, "imports": ["_vendor.js"]},
+            "_vendor.js": {"file": "assets/vendor.js"},
+        }))
+        return MagicMock(returncode=0)
+    return popen
+
+
+def test_vite_bundle_builds_once_and_splits_manifest(tmp_path):
+    calls = []
+    popen = _fake_bundle(tmp_path, calls)
+
+    def frontends():
+        module = _app(tmp_path / "app" / "modules", "shop")
+        module.url_prefix = "/shop"
+        shop = vite.Frontend(module)
+        app = vite.Frontend(_app(tmp_path, "app"))
+        vite.build_bundle(app)
+        return shop, app
+
+    with patch.object(vite, "home", tmp_path), patch.object(vite, "enabled", lambda key: key == "VITE_BUNDLE"), \
+            patch.object(vite.subprocess, "Popen", popen):
+        (tmp_path / "app" / "modules").mkdir(parents=True)
+        shop, app = frontends()
+        app.loader.join()
+        assert calls == ["vite.config.bundle.js"]
+        assert shop.dist == app.dist and shop.prefix == app.prefix == "/vite"
+        assert vite.resolve_entry(shop.manifest, "main.js")[0] == ["assets/shop.js", "assets/vendor.js"]
+        assert vite.resolve_entry(app.manifest, "main.js")[0] == ["assets/app.js", "assets/vendor.js"]
+
+        shop, app = frontends()
+        assert len(calls) == 1 and shop.loader is None
+        assert "assets/shop.js" in shop.vite("main.js")
+
+
+def _shop_module(tmp_path, monkeypatch):
+    from flaskpp import Module
+
+    shop_root = tmp_path / "app" / "modules" / "shop"
+    shop_root.mkdir(parents=True)
+    (shop_root.parent / "__init__.py").write_text("")
+    (shop_root / "__init__.py").write_text("")
+    (shop_root / "manifest.json").write_text('{"version": "0.1", "description": "Shop", "author": "me"}')
+    monkeypatch.syspath_prepend(str(tmp_path / "app"))
+    for name in ("modules", "modules.shop"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return Module(str(shop_root / "__init__.py"), "modules.shop")
+
+
+def test_enabled_modules_join_the_app_bundle(tmp_path, monkeypatch):
+    calls = []
+    switches = lambda key: key in ("VITE_BUNDLE", "FRONTEND_ENGINE")
+
+    with patch.object(vite, "home", tmp_path), patch.object(vite, "enabled", switches), \
+            patch("flaskpp.enabled", switches), patch.object(vite.subprocess, "Popen", _fake_bundle(tmp_path, calls)):
+        app = _app(tmp_path, "app")
+        module = _shop_module(tmp_path, monkeypatch)
+        module.enable(app, False)
+        assert calls == [] and vite._bundle == [module.frontend_engine]
+
+        engine = vite.Frontend(app)
+        vite.build_bundle(engine)
+        engine.loader.join()
+
+    shop = module.frontend_engine
+    assert calls == ["vite.config.bundle.js"]
+    assert shop.dist == engine.dist and shop.prefix == engine.prefix == "/vite"
+    assert "/vite/assets/shop.js" in shop.vite("main.js")
+
+
+def test_prebuilt_frontends_never_spawn_node(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    node = tmp_path / "node"
+    node.mkdir()
+    (tmp_path / "modules" / "shop").mkdir(parents=True)
+    roots = [tmp_path / "vite", tmp_path / "modules" / "shop" / "vite"]
+    calls = []
+
+    with patch.object(vite, "home", node), patch.object(vite, "enabled", return_value=False), \
+            patch.object(vite.subprocess, "Popen", _fake_build(calls)):
+        frontends = vite.build_frontends(roots, tmp_path / "builds" / "1")
+    assert len(calls) == 2
+    assert frontends["modules/shop/vite"] == {"dist": "frontends/modules/shop/vite", "prefix": ""}
+    (tmp_path / "builds" / "1" / "index.json").write_text(json.dumps({"id": "1", "frontends": frontends}))
+    (tmp_path / "builds" / "LATEST").write_text("1")
+    for root in roots:
+        vite.shutil.rmtree(root / "dist")
+
+    vite._prebuilt.clear()
+    with patch.object(vite, "home", node), patch.object(vite, "enabled", lambda key: key == "PREBUILT_FRONTEND"), \
+            patch.object(vite.subprocess, "Popen", side_effect=AssertionError("node spawned")):
+        module = _app(tmp_path / "modules", "shop")
+        engine = vite.Frontend(module)
+        assert engine.built and engine.dist.is_relative_to(tmp_path / "builds" / "1")
+        assert "assets/main.js" in engine.vite("main.js")
+
+        vite._prebuilt.clear()
+        (tmp_path / "builds" / "LATEST").write_text("2")
+        with pytest.raises(vite.ViteError, match="'2' not found"):
+            vite.Frontend(_app(tmp_path / "modules", "shop"))
+    vite._prebuilt.clear()
+
+
+def test_prebuilt_bundle_shares_dist_and_prefix(tmp_path, monkeypatch):
+    calls = []
+    node = tmp_path / "node"
+    node.mkdir()
+    module = _shop_module(tmp_path, monkeypatch)
+    monkeypatch.chdir(tmp_path / "app")
+    roots = [tmp_path / "app" / "vite", tmp_path / "app" / "modules" / "shop" / "vite"]
+
+    with patch.object(vite, "home", node), patch.object(vite, "enabled", return_value=False), \
+            patch.object(vite.subprocess, "Popen", _fake_bundle(tmp_path, calls)):
+        frontends = vite.build_frontends(roots, tmp_path / "app" / "builds" / "1", "/vite")
+    assert calls == ["vite.config.bundle.js"]
+    (tmp_path / "app" / "builds" / "1" / "index.json").write_text(json.dumps({"id": "1", "frontends": frontends}))
+    (tmp_path / "app" / "builds" / "LATEST").write_text("1")
+    vite.shutil.rmtree(roots[0] / "dist")
+
+    vite._prebuilt.clear()
+    switches = lambda key: key in ("VITE_BUNDLE", "PREBUILT_FRONTEND", "FRONTEND_ENGINE")
+    with patch.object(vite, "home", node), patch.object(vite, "enabled", switches), patch("flaskpp.enabled", switches), \
+            patch.object(vite.subprocess, "Popen", side_effect=AssertionError("node spawned")):
+        app = _app(tmp_path, "app")
+        module.enable(app, False)
+        engine = vite.Frontend(app)
+        vite.build_bundle(engine)
+    vite._prebuilt.clear()
+
+    shop = module.frontend_engine
+    assert shop.dist == engine.dist and shop.dist.is_relative_to(tmp_path / "app" / "builds" / "1")
+    assert shop.prefix == engine.prefix == "/vite"
+    assert '<script type="module" src="/vite/assets/shop.js"></script>' in shop.vite("main.js")
+    assert '<script type="module" src="/vite/assets/app.js"></script>' in engine.vite("main.js")
+
+
+def test_vite_tags_are_ordered_preloaded_and_memoized(tmp_path):
+    manifest = {
+        "main.js": vite.ManifestChunk(file="assets/main.js", css=["assets/main.css"], imports=["_a.js", "_b.js"],
+                                      dynamicImports=["page.js"], isEntry=True),
+        "_a.js": vite.ManifestChunk(file="assets/a.js", css=["assets/a.css"], imports=["_b.js"]),
+        "_b.js": vite.ManifestChunk(file="assets/b.js"),
+        "page.js": vite.ManifestChunk(file="assets/page.js", imports=["_b.js"], isDynamicEntry=True),
+        "src/theme.css": vite.ManifestChunk(file="assets/theme.css", isEntry=True),
+    }
+    calls = []
+    with patch.object(vite, "home", tmp_path), patch.object(vite, "enabled", return_value=False), \
+            patch.object(vite.subprocess, "Popen", _fake_build(calls)):
+        engine = vite.Frontend(_app(tmp_path))
+        engine.loader.join()
+    engine.manifest = manifest
+
+    assert engine.vite("main.js") == (
+        '<link rel="stylesheet" href="/vite/assets/main.css">\n'
+        '<link rel="stylesheet" href="/vite/assets/a.css">\n'
+        '<script type="module" src="/vite/assets/main.js"></script>\n'
+        '<link rel="modulepreload" href="/vite/assets/a.js">\n'
+        '<link rel="modulepreload" href="/vite/assets/b.js">'
+    )
+    assert engine.vite("main.js", preload_dynamic=True).endswith('<link rel="modulepreload" href="/vite/assets/page.js">')
+    assert engine.vite("src/theme.css") == '<link rel="stylesheet" href="/vite/assets/theme.css">'
+
+    with patch.object(vite, "resolve_entry", side_effect=AssertionError("resolved twice")):
+        assert "assets/main.js" in engine.vite("main.js")